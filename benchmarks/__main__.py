@@ -0,0 +1,45 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks import micro, scaling
+
+if __name__ == '__main__':
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Run the benchmarks of the ECS and the engine and write their results to a JSON file."
+    )
+    parser.add_argument('--output', default='benchmarks.json', help='path of the JSON file')
+    parser.add_argument('--parts', nargs='+', default=['micro', 'scaling', 'endtoend'], help='benchmarks to run')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='amounts of Entities')
+    parser.add_argument('--threads', type=int, default=None, help='maximal amount of threads for the scaling')
+    parser.add_argument('--frames', type=int, default=600, help='measured frames of the end-to-end run')
+    arguments: argparse.Namespace = parser.parse_args()
+
+    # The end-to-end benchmark changes the working directory to the game folder.
+    outputPath: str = os.path.abspath(arguments.output)
+    results: {str, dict} = {
+        'date': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+    if 'micro' in arguments.parts:
+        results['micro'] = micro.run(arguments.sizes)
+
+    if 'scaling' in arguments.parts:
+        results['scaling'] = scaling.run(arguments.threads)
+
+    if 'endtoend' in arguments.parts:
+        from benchmarks import endtoend
+        results['endtoend'] = endtoend.run(arguments.frames)
+
+    with open(outputPath, 'w') as outputFile:
+        json.dump(results, outputFile, indent=2)
+
+    print("Results written to {}".format(outputPath))
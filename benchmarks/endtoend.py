@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# The engine imports the game data, which opens the main window and loads resources relatively to the game folder.
+GameDirectory: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'game')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.chdir(GameDirectory)
+sys.path.insert(0, os.path.dirname(GameDirectory))
+sys.path.insert(0, GameDirectory)
+
+from benchmarks.timing import percentile
+from game.appdata import AppData
+from game.crystalshot import CrystalShot
+
+
+def run(frames: int = 600, warmupFrames: int = 60, framerate: int = 60) -> {str, float}:
+    """Run the Crystal Shot game as game/__main__.py does, the World being driven with a fixed timestep, without
+    waiting between the frames (on the dummy video driver by default). Get the frames per second, the median, 99th
+    percentile and maximal frame durations (in seconds) and the simulation steps run and dropped."""
+    game: CrystalShot = CrystalShot(framerate)
+    AppData.window().framerate = 0
+    durations: [float] = []
+    amountSteps: int = 0
+    previousTime: float = time.perf_counter()
+
+    try:
+        for frame in range(warmupFrames + frames):
+            startTime: float = time.perf_counter()
+            AppData.window().clear()
+            # The game waits for the next frame when it is ahead of its framerate: the elapsed time it gives to the
+            # World is at least a frame.
+            steps: int = game.world.advance(max(startTime - previousTime, 1. / framerate))
+            previousTime = startTime
+            AppData.window().update()
+
+            if frame >= warmupFrames:
+                durations.append(time.perf_counter() - startTime)
+                amountSteps += steps
+    finally:
+        game.world.stop()
+
+    return {
+        'frames': frames,
+        'fps': frames / sum(durations),
+        'p50': percentile(durations, 50),
+        'p99': percentile(durations, 99),
+        'max': max(durations),
+        'steps': amountSteps,
+        'droppedSteps': game.world.droppedSteps
+    }
+
+
+if __name__ == '__main__':
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=run.__doc__)
+    parser.add_argument('--frames', type=int, default=600, help='measured frames')
+    arguments: argparse.Namespace = parser.parse_args()
+    print(json.dumps(run(arguments.frames), indent=2))
@@ -0,0 +1,83 @@
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+# The engine imports the game data, which opens the main window and loads resources relatively to the game folder.
+GameDirectory: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'game')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.chdir(GameDirectory)
+sys.path.insert(0, os.path.dirname(GameDirectory))
+sys.path.insert(0, GameDirectory)
+
+from ecs.world import World
+from engine.components.spritecomponent import SpriteComponent, SpriteProcessing
+from engine.components.gameplay.charastatscomponent import CharacterPropertiesComponent, CharacterPropertiesProcessing
+from engine.components.gameplay.aicomponent import AIComponent, AIProcessing
+from engine.direction import Direction
+from engine.geometry import Point
+from engine.graphics.sprite import Sprite
+from game.appdata import SystemName, AnimationName
+
+
+def createBotWorld() -> World:
+    """Create a World with the Systems a bot is made of."""
+    world: World = World()
+    world.system(SystemName.sprite(), SpriteComponent, SpriteProcessing)
+    world.system(SystemName.characterProperties(), CharacterPropertiesComponent, CharacterPropertiesProcessing)
+    world.system(SystemName.ai(), AIComponent, AIProcessing)
+    return world
+
+
+def spawnBots(world: World, count: int) -> None:
+    """Spawn bots as the game does: a walking Sprite, character properties and an AI."""
+    WalkAnimationDirections: {Direction, int} = {
+        Direction.UP: 8,
+        Direction.LEFT: 9,
+        Direction.DOWN: 10,
+        Direction.RIGHT: 11
+    }
+
+    def initSprite(spriteComponent: SpriteComponent, index: int) -> None:
+        spriteComponent.sprite = Sprite('resources/img/sprites/skeleton.png', 64, 64)
+        spriteComponent.sprite.addAnimation(AnimationName.walk(), WalkAnimationDirections, 9)
+        spriteComponent.sprite.changeAnimation(AnimationName.walk())
+        spriteComponent.sprite.position = Point(index % 800, index % 600)
+
+    def initProperties(propertiesComponent: CharacterPropertiesComponent, index: int) -> None:
+        propertiesComponent.name = "Bot"
+        propertiesComponent.life = 5000
+
+    world.spawnBatch(count, {
+        SystemName.sprite(): initSprite,
+        SystemName.characterProperties(): initProperties,
+        SystemName.ai(): None
+    })
+
+
+def measureBotMemory(count: int) -> float:
+    """Get the amount of bytes allocated by the Python heap per bot. The pixels of the Sprite surfaces are allocated
+    by SDL and are not part of this figure (64 * 64 * 4 bytes per bot for the game sprites)."""
+    world: World = createBotWorld()
+
+    try:
+        spawnBots(world, 1)  # Load the sprite sheet and warm the caches up.
+        gc.collect()
+        tracemalloc.start()
+        before: int = tracemalloc.get_traced_memory()[0]
+        spawnBots(world, count)
+        gc.collect()
+        after: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        world.stop()
+
+    return (after - before) / count
+
+
+if __name__ == '__main__':
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=measureBotMemory.__doc__)
+    parser.add_argument('--count', type=int, default=10000, help='amount of bots to spawn')
+    arguments: argparse.Namespace = parser.parse_args()
+    print('{:.0f} bytes per bot ({} bots)'.format(measureBotMemory(arguments.count), arguments.count))
@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.timing import measure
+from ecs.components import Component
+from ecs.entities import Entity
+from ecs.jobs import Job
+from ecs.systems import SystemProcessing
+from ecs.world import World
+
+
+class PositionComponent(Component):
+    """Component of the benchmarks, present on every Entity."""
+
+    __slots__ = ('m_x', 'm_y')
+
+    def __init__(self, entity: Entity) -> None:
+        """Create a new PositionComponent instance."""
+        super().__init__(entity)
+        self.m_x: int = 0
+        self.m_y: int = 0
+
+
+class VelocityComponent(Component):
+    """Component of the benchmarks, present on half of the Entities."""
+
+    __slots__ = ('m_dx', 'm_dy')
+
+    def __init__(self, entity: Entity) -> None:
+        """Create a new VelocityComponent instance."""
+        super().__init__(entity)
+        self.m_dx: int = 1
+        self.m_dy: int = 1
+
+
+class IdleProcessing(SystemProcessing):
+    """Processing doing nothing, the benchmarks drive the Components themselves."""
+
+    def run(self, linkedSystems: {str, 'System'}, fromIndex: int, toIndex: int) -> None:
+        """Do nothing."""
+        return
+
+
+def createWorld() -> World:
+    """Create a World with the Systems of the benchmarks."""
+    world: World = World(1)
+    world.system('Position', PositionComponent, IdleProcessing)
+    world.system('Velocity', VelocityComponent, IdleProcessing)
+    return world
+
+
+def spawn(world: World, count: int) -> [Entity]:
+    """Spawn Entities with a PositionComponent, and a VelocityComponent for one Entity out of two."""
+    entities: [Entity] = world.spawnBatch(count, {'Position': None})
+    world.system('Velocity').createMany(entities[::2])
+    return entities
+
+
+def benchmarkSize(count: int, repeat: int) -> {str, dict}:
+    """Run the microbenchmarks for the given amount of Entities."""
+    world: World = createWorld()
+
+    try:
+        return benchmarkWorld(world, count, repeat)
+    finally:
+        world.stop()
+
+
+def benchmarkWorld(world: World, count: int, repeat: int) -> {str, dict}:
+    """Run the microbenchmarks for the given amount of Entities in a World created by createWorld."""
+    results: {str, dict} = {}
+    positionSystem: 'System' = world.system('Position')
+    entities: [Entity] = []
+
+    def clearWorld() -> None:
+        world.clear()
+        entities.clear()
+
+    def createEntities() -> None:
+        for _ in range(count):
+            entities.append(world.createEntity())
+
+    results['createEntity'] = measure(createEntities, repeat, clearWorld)
+    results['spawnBatch'] = measure(lambda: spawn(world, count), repeat, clearWorld)
+
+    def spawnEntities() -> None:
+        clearWorld()
+        entities.extend(spawn(world, count))
+
+    def deleteEntities() -> None:
+        for entity in entities:
+            world.delete(entity)
+
+    results['delete'] = measure(deleteEntities, repeat, spawnEntities)
+    results['deleteMany'] = measure(lambda: world.deleteMany(entities), repeat, spawnEntities)
+
+    spawnEntities()
+    values: [int] = [entity.value for entity in entities]
+
+    def lookUp() -> None:
+        for value in values:
+            positionSystem.componentFor(value)
+
+    def iterate() -> None:
+        for component in positionSystem.components():
+            component.m_x += 1
+
+    results['componentFor'] = measure(lookUp, repeat)
+    results['iterate'] = measure(iterate, repeat)
+
+    def invalidateQuery() -> None:
+        # A structural change makes the Query rebuild its tuples.
+        world.delete(world.spawnBatch(1, {'Position': None, 'Velocity': None})[0])
+
+    def queryAndIterate() -> None:
+        for position, velocity in world.query(PositionComponent, VelocityComponent):
+            position.m_x += velocity.m_dx
+
+    results['queryRebuild'] = measure(lambda: world.query(PositionComponent, VelocityComponent), repeat, invalidateQuery)
+    results['queryIterate'] = measure(queryAndIterate, repeat)
+    return results
+
+
+def benchmarkRecorder(count: int, repeat: int, frames: int = 100) -> {str, dict}:
+    """Run the same frames with a Job given no FrameRecorder (the baseline), a disabled one and an enabled one."""
+    world: World = createWorld()
+
+    try:
+        spawn(world, count)
+        systems: ['System'] = [world.system('Position'), world.system('Velocity')]
+        baselineJob: Job = Job('Baseline', systems, 4, world.workers)
+        recordedJob: Job = Job('Recorded', systems, 4, world.workers, recorder=world.recorder)
+
+        def executeBaseline() -> None:
+            for _ in range(frames):
+                baselineJob.execute()
+
+        def executeRecorded() -> None:
+            for _ in range(frames):
+                recordedJob.execute()
+
+        results: {str, dict} = {
+            'withoutRecorder': measure(executeBaseline, repeat),
+            'recorderDisabled': measure(executeRecorded, repeat)
+        }
+        world.recorder.enable()
+        results['recorderEnabled'] = measure(executeRecorded, repeat, world.recorder.clear)
+        world.recorder.disable()
+        return results
+    finally:
+        world.stop()
+
+
+def run(sizes: [int] = (1000, 10000, 100000), repeat: int = 5) -> {str, dict}:
+    """Run the microbenchmarks of entity creation/deletion, Component lookup, iteration and Query for each amount of
+    Entities, and of the overhead of the FrameRecorder on the frames of a Job. Durations are in seconds, for all the
+    Entities."""
+    results: {str, dict} = {str(count): benchmarkSize(count, repeat) for count in sizes}
+    results['recorder'] = benchmarkRecorder(min(sizes), repeat)
+    return results
+
+
+if __name__ == '__main__':
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=run.__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='amounts of Entities')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per benchmark')
+    arguments: argparse.Namespace = parser.parse_args()
+    print(json.dumps(run(arguments.sizes, arguments.repeat), indent=2))
@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.timing import measure
+from ecs.components import Component
+from ecs.entities import Entity
+from ecs.systems import SystemProcessing
+from ecs.world import World
+
+
+class WorkComponent(Component):
+    """Component of the scaling benchmark."""
+
+    __slots__ = ('m_value',)
+
+    def __init__(self, entity: Entity) -> None:
+        """Create a new WorkComponent instance."""
+        super().__init__(entity)
+        self.m_value: int = 0
+
+
+class WorkProcessing(SystemProcessing):
+    """CPU-bound processing: a fixed amount of arithmetic per Component."""
+
+    Iterations: int = 50
+
+    def run(self, linkedSystems: {str, 'System'}, fromIndex: int, toIndex: int) -> None:
+        """Perform the processing of the Components in the range."""
+        for component in self.m_components.allComponents()[fromIndex:toIndex]:
+            value: int = component.m_value
+
+            for iteration in range(WorkProcessing.Iterations):
+                value = (value * 31 + iteration) % 1000003
+
+            component.m_value = value
+
+
+def measureThreads(threadCount: int, count: int, frames: int, repeat: int) -> {str, float}:
+    """Get the durations of frames of a Job split in threadCount threads, with as many workers."""
+    world: World = World(threadCount)
+
+    def runFrames() -> None:
+        for _ in range(frames):
+            world.run()
+
+    try:
+        world.system('Work', WorkComponent, WorkProcessing)
+        world.spawnBatch(count, {'Work': None})
+        world.addJob('Work', ['Work'], threadCount)
+        world.run()  # Let the Job measure the cost of the System to size its chunks.
+        result: {str, float} = measure(runFrames, repeat)
+    finally:
+        world.stop()
+
+    return {name: duration / frames for name, duration in result.items()}
+
+
+def run(maxThreads: int = None, count: int = 10000, frames: int = 10, repeat: int = 3) -> {str, dict}:
+    """Run a CPU-bound System in a Job split in 1 to maxThreads threads (twice the amount of cores by default) and
+    get the durations of the frames (in seconds) and the speedup relative to a single thread."""
+    maxThreads = maxThreads or 2 * (os.cpu_count() or 1)
+    results: {str, dict} = {}
+
+    for threadCount in range(1, maxThreads + 1):
+        results[str(threadCount)] = measureThreads(threadCount, count, frames, repeat)
+        results[str(threadCount)]['speedup'] = results['1']['median'] / results[str(threadCount)]['median']
+
+    return results
+
+
+if __name__ == '__main__':
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=run.__doc__)
+    parser.add_argument('--threads', type=int, default=None, help='maximal amount of threads')
+    parser.add_argument('--count', type=int, default=10000, help='amount of Components')
+    parser.add_argument('--frames', type=int, default=10, help='frames per run')
+    arguments: argparse.Namespace = parser.parse_args()
+    print(json.dumps(run(arguments.threads, arguments.count, arguments.frames), indent=2))
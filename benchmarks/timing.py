@@ -0,0 +1,25 @@
+import time
+
+
+def measure(function: 'function', repeat: int = 5, setup: 'function' = None) -> {str, float}:
+    """Run a function several times, calling setup (if any) before each run out of the measure, and get the best and
+    median durations (in seconds)."""
+    durations: [float] = []
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        startTime: float = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - startTime)
+
+    durations.sort()
+    return {'best': durations[0], 'median': durations[len(durations) // 2]}
+
+
+def percentile(values: [float], rank: float) -> float:
+    """Get the value under which the given percentage of the values are (nearest rank)."""
+    sortedValues: [float] = sorted(values)
+    index: int = min(len(sortedValues) - 1, max(0, int(round(rank / 100. * len(sortedValues) + 0.5)) - 1))
+    return sortedValues[index]
@@ -0,0 +1,193 @@
+import numpy
+from multiprocessing import shared_memory
+from typing import Any
+from ecs.components import Component, ComponentFactory, ComponentStorage, Entity, Type
+
+
+class ColumnarComponent(Component):
+    """Base class for a Component whose numeric fields are stored in typed NumPy columns of its ComponentFactory, at
+    the dense slot of the Component. Subclasses declare their columns in the Columns class member, as
+    {name: (dtype, default value)}, and read/write them with getField/setField."""
+
+    __slots__ = ('m_slot',)
+
+    Columns: {str, (numpy.dtype, Any)} = {}
+
+    def __init__(self, entity: Entity) -> None:
+        """Create a new ColumnarComponent instance."""
+        super().__init__(entity)
+        self.m_slot: int = 0
+
+    @classmethod
+    def storage(cls) -> ComponentStorage:
+        """Get the layout used by the ComponentFactory to store the Components of this type. Columns need the dense
+        list of a sparse set."""
+        return ComponentStorage.SPARSE_SET
+
+    @classmethod
+    def factoryClass(cls) -> Type['ColumnarComponentFactory']:
+        """Get the type of ComponentFactory storing the Components of this type."""
+        return ColumnarComponentFactory
+
+    @property
+    def slot(self) -> int:
+        """Get the dense slot of the Component, ie. its row in the columns."""
+        return self.m_slot
+
+    @property
+    def factory(self) -> 'ColumnarComponentFactory':
+        """Get the ComponentFactory storing the Component and its columns."""
+        return self.m_factory
+
+    def getField(self, name: str) -> Any:
+        """Get the value of a column for the current Component."""
+        return self.m_factory.m_columns[name][self.m_slot].item()
+
+    def setField(self, name: str, value: Any) -> None:
+        """Set the value of a column for the current Component and mark it as changed."""
+        self.m_factory.m_columns[name][self.m_slot] = value
+        self.m_factory.markChanged(self)
+
+
+class ColumnarComponentFactory(ComponentFactory):
+    """Factory of ColumnarComponents, storing their fields in one NumPy array per column, indexed by dense slot."""
+
+    InitialCapacity: int = 64
+
+    def __init__(self, memberClass: Type[ColumnarComponent]) -> None:
+        """Create a new ColumnarComponentFactory instance."""
+        super().__init__(memberClass)
+        self.m_blocks: {str, shared_memory.SharedMemory} = {}
+        self.m_retiredBlocks: [shared_memory.SharedMemory] = []
+        self.m_shared: bool = False
+        self.m_columns: {str, numpy.ndarray} = {
+            name: numpy.zeros(ColumnarComponentFactory.InitialCapacity, dtype=dtype)
+            for name, (dtype, default) in memberClass.Columns.items()
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Get the amount of Components the columns can hold before being reallocated."""
+        return len(next(iter(self.m_columns.values()))) if self.m_columns else 0
+
+    @property
+    def shared(self) -> bool:
+        """Check if the columns are stored in shared memory."""
+        return self.m_shared
+
+    def shareColumns(self) -> None:
+        """Move the columns to shared memory blocks. Blocks are reallocated (under a new name) when the columns
+        grow."""
+        if not self.m_shared:
+            self.m_shared = True
+            self.__grow(self.capacity)
+
+    def releaseSharedColumns(self) -> None:
+        """Move the columns back to private memory and free the shared memory blocks."""
+        if self.m_shared:
+            self.m_shared = False
+            self.__grow(self.capacity)
+
+    @property
+    def sharedColumns(self) -> {str, (str, str, int)}:
+        """Get the description of the shared columns, as {name: (shared memory block name, dtype, capacity)}, for
+        worker processes to attach to them."""
+        return {
+            name: (self.m_blocks[name].name, column.dtype.str, len(column))
+            for name, column in self.m_columns.items()
+        }
+
+    def create(self, entity: Entity) -> ColumnarComponent:
+        """Create a new ColumnarComponent instance, store it in the ComponentFactory and reset its row of the columns
+        to the default values."""
+        slot: int = len(self.m_components)
+
+        if slot >= self.capacity:
+            self.__grow(max(ColumnarComponentFactory.InitialCapacity, 2 * slot))
+
+        for name, (dtype, default) in self.m_memberClass.Columns.items():
+            self.m_columns[name][slot] = default
+
+        newComponent: ColumnarComponent = super().create(entity)
+        newComponent.m_slot = slot
+        return newComponent
+
+    def createMany(self, entities: [Entity]) -> [ColumnarComponent]:
+        """Create a new ColumnarComponent instance for each of the given Entities, store them in the
+        ComponentFactory and reset their rows of the columns to the default values."""
+        firstSlot: int = len(self.m_components)
+        endSlot: int = firstSlot + len(entities)
+
+        if endSlot > self.capacity:
+            self.__grow(max(ColumnarComponentFactory.InitialCapacity, 2 * endSlot))
+
+        for name, (dtype, default) in self.m_memberClass.Columns.items():
+            self.m_columns[name][firstSlot:endSlot] = default
+
+        newComponents: [ColumnarComponent] = super().createMany(entities)
+
+        for slot, newComponent in enumerate(newComponents, firstSlot):
+            newComponent.m_slot = slot
+
+        return newComponents
+
+    def moveSlot(self, fromSlot: int, toSlot: int) -> None:
+        """Move the Component and its row of the columns at a slot to another slot."""
+        super().moveSlot(fromSlot, toSlot)
+        self.m_components[toSlot].m_slot = toSlot
+
+        for column in self.m_columns.values():
+            column[toSlot] = column[fromSlot]
+
+    def column(self, name: str, fromIndex: int = 0, toIndex: int = None) -> numpy.ndarray:
+        """Get a view on a column, restricted to the given index range of the Components."""
+        count: int = len(self.m_components)
+        toIndex = count if toIndex is None else min(toIndex, count)
+        return self.m_columns[name][fromIndex:toIndex]
+
+    def columns(self, fromIndex: int = 0, toIndex: int = None) -> {str, numpy.ndarray}:
+        """Get views on all the columns, restricted to the given index range of the Components."""
+        return {name: self.column(name, fromIndex, toIndex) for name in self.m_columns}
+
+    def __grow(self, capacity: int) -> None:
+        """Reallocate the columns so that they can hold the given amount of Components, in shared memory if the
+        columns are shared."""
+        previousBlocks: [shared_memory.SharedMemory] = list(self.m_blocks.values())
+        self.m_blocks = {}
+        self.m_columns = {
+            name: self.__grownColumn(name, column, capacity) for name, column in self.m_columns.items()
+        }
+
+        for block in previousBlocks:
+            block.unlink()
+
+        self.__closeBlocks(self.m_retiredBlocks + previousBlocks)
+
+    def __grownColumn(self, name: str, column: numpy.ndarray, capacity: int) -> numpy.ndarray:
+        """Get a copy of a column, reallocated to the given capacity."""
+        if self.m_shared:
+            block: shared_memory.SharedMemory = shared_memory.SharedMemory(
+                create=True,
+                size=max(1, capacity * column.dtype.itemsize)
+            )
+            self.m_blocks[name] = block
+            # Unlike numpy.ndarray(buffer=...), frombuffer keeps the block exported while views exist, so that
+            # closing it fails instead of leaving dangling views.
+            grownColumn: numpy.ndarray = numpy.frombuffer(block.buf, dtype=column.dtype, count=capacity)
+            grownColumn.fill(0)
+        else:
+            grownColumn: numpy.ndarray = numpy.zeros(capacity, dtype=column.dtype)
+
+        grownColumn[:len(column)] = column
+        return grownColumn
+
+    def __closeBlocks(self, blocks: [shared_memory.SharedMemory]) -> None:
+        """Close the given shared memory blocks. Blocks still referenced by views cannot be closed yet: they are
+        retried on the next reallocation."""
+        self.m_retiredBlocks = []
+
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                self.m_retiredBlocks.append(block)
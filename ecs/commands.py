@@ -0,0 +1,116 @@
+import threading
+from enum import Enum
+from typing import Any, Callable, Optional, Union
+from ecs.entities import Entity
+
+
+class CommandType(Enum):
+    """Structural changes that can be recorded in a CommandBuffer, in the order they are applied."""
+    CREATE_ENTITY = 0
+    ADD_COMPONENT = 1
+    ADD_TAG = 2
+    REMOVE_COMPONENT = 3
+    REMOVE_TAG = 4
+    DESTROY_ENTITY = 5
+
+
+class PendingEntity:
+    """Placeholder for an Entity whose creation has been recorded in a CommandBuffer. It can be used in the other
+    commands of the buffers and gets its Entity once the buffers are applied."""
+
+    def __init__(self) -> None:
+        """Create a new PendingEntity instance."""
+        self.m_entity: Optional[Entity] = None
+
+    @property
+    def entity(self) -> Optional[Entity]:
+        """Get the created Entity, None until the CommandBuffer is applied."""
+        return self.m_entity
+
+
+class CommandBuffer:
+    """Structural changes recorded by a single thread while Systems are running, applied later by the World."""
+
+    # Class members.
+    Local: threading.local = threading.local()
+
+    # Object methods.
+    def __init__(self, order: int = 0) -> None:
+        """Create a new CommandBuffer instance. The order sorts the buffers of a same Job when they are applied."""
+        self.m_order: int = order
+        self.m_commands: [tuple] = []
+
+    def createEntity(self) -> PendingEntity:
+        """Record the creation of an Entity."""
+        pendingEntity: PendingEntity = PendingEntity()
+        self.__record(CommandType.CREATE_ENTITY, pendingEntity)
+        return pendingEntity
+
+    def addComponent(
+        self,
+        entity: Union[Entity, PendingEntity],
+        systemName: str,
+        initializer: Callable[[Any], None] = None
+    ) -> None:
+        """Record the creation of a Component by a System for an Entity. The initializer, if any, is called with the
+        new Component."""
+        self.__record(CommandType.ADD_COMPONENT, entity, systemName, initializer)
+
+    def removeComponent(self, entity: Union[Entity, PendingEntity], systemName: str) -> None:
+        """Record the deletion of the Component(s) of a System attached to an Entity."""
+        self.__record(CommandType.REMOVE_COMPONENT, entity, systemName)
+
+    def addTag(self, entity: Union[Entity, PendingEntity], tag: str) -> None:
+        """Record the addition of a tag to an Entity."""
+        self.__record(CommandType.ADD_TAG, entity, tag)
+
+    def removeTag(self, entity: Union[Entity, PendingEntity], tag: str) -> None:
+        """Record the removal of a tag from an Entity."""
+        self.__record(CommandType.REMOVE_TAG, entity, tag)
+
+    def destroyEntity(self, entity: Union[Entity, PendingEntity]) -> None:
+        """Record the deletion of an Entity and all its Components."""
+        self.__record(CommandType.DESTROY_ENTITY, entity)
+
+    def clear(self) -> None:
+        """Forget all the recorded commands."""
+        self.m_commands.clear()
+
+    @property
+    def commands(self) -> [tuple]:
+        """Get the recorded commands as (type, buffer order, sequence, entity, system or tag name, initializer)
+        tuples."""
+        return self.m_commands
+
+    def __len__(self) -> int:
+        """Get the amount of recorded commands."""
+        return len(self.m_commands)
+
+    def __record(
+        self,
+        commandType: CommandType,
+        entity: Union[Entity, PendingEntity],
+        systemName: str = None,
+        initializer: Callable[[Any], None] = None
+    ) -> None:
+        """Record a command."""
+        self.m_commands.append((commandType, self.m_order, len(self.m_commands), entity, systemName, initializer))
+
+    # Class methods.
+    @staticmethod
+    def Current() -> Optional['CommandBuffer']:
+        """Get the CommandBuffer of the calling thread, None if the thread is not running Systems."""
+        return getattr(CommandBuffer.Local, 'buffer', None)
+
+    @staticmethod
+    def SetCurrent(buffer: Optional['CommandBuffer']) -> None:
+        """Set the CommandBuffer of the calling thread."""
+        CommandBuffer.Local.buffer = buffer
+
+    @staticmethod
+    def Sorted(buffers: ['CommandBuffer']) -> [tuple]:
+        """Get the commands of several buffers sorted by type, then buffer order, then recording order."""
+        return sorted(
+            (command for buffer in buffers for command in buffer.commands),
+            key=lambda command: (command[0].value, command[1], command[2])
+        )
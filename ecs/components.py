@@ -1,6 +1,6 @@
 from enum import Enum
 from termcolor import colored
-from typing import TypeVar, Generic, List, Type
+from typing import TypeVar, Generic, Dict, List, Optional, Tuple, Type
 from ecs.entities import Entity
 
 
@@ -10,18 +10,45 @@ class ComponentQuantity(Enum):
     MANY = 1
 
 
+class ComponentStorage(Enum):
+    """Layout of the Components of a same type in their ComponentFactory."""
+    # Components are kept in creation order, a deletion compacts the whole list.
+    ORDERED = 0
+    # Dense list of Components plus an Entity -> slots map, a deletion swaps the Component with the last one.
+    SPARSE_SET = 1
+    # Dense list in which the Components of an Entity form a contiguous run, a deletion leaves holes that are
+    # compacted once before the next iteration.
+    RUNS = 2
+
+
 class Component:
-    """Base class for defining a Component of the ecs architecture."""
+    """Base class for defining a Component of the ecs architecture. Components are slotted (no per-instance __dict__):
+    a subclass declares its own fields in __slots__, otherwise its instances get a __dict__ back."""
+
+    __slots__ = ('m_entity', 'm_factory')
 
     def __init__(self, entity: Entity) -> None:
         """Create a new Component instance."""
         self.m_entity: Entity = entity
+        self.m_factory: 'ComponentFactory' = None
 
     @classmethod
     def quantity(cls) -> ComponentQuantity:
         """Get the quantity of the Component type a single Entity can bear."""
         return ComponentQuantity.ONE
 
+    @classmethod
+    def storage(cls) -> ComponentStorage:
+        """Get the layout used by the ComponentFactory to store the Components of this type."""
+        if cls.quantity() is ComponentQuantity.MANY:
+            return ComponentStorage.RUNS
+        return ComponentStorage.SPARSE_SET
+
+    @classmethod
+    def factoryClass(cls) -> Type['ComponentFactory']:
+        """Get the type of ComponentFactory storing the Components of this type."""
+        return ComponentFactory
+
     @property
     def entity(self) -> Entity:
         """Get the Entity to which the current Component is attached to."""
@@ -36,6 +63,17 @@ class Component:
         """Check if the Entity owning the Component is valid."""
         return self.m_entity.isValid
 
+    def reset(self) -> None:
+        """Reset the data of the Component when it is put back in the pool of its ComponentFactory, to be reused for
+        another Entity. Subclasses of pooled Components release their references and restore their default values
+        here."""
+        return
+
+    def markChanged(self) -> None:
+        """Notify the ComponentFactory storing the Component that its data has changed."""
+        if self.m_factory is not None:
+            self.m_factory.markChanged(self)
+
     def __str__(self):
         return '{} {}'.format(__class__, str(self.m_entity))
 
@@ -50,32 +88,316 @@ class ComponentFactory(Generic[TConcreteComponent]):
         """Create a new ComponentFactory instance.
          There should be only one ComponentFactory in a application."""
         self.m_components: List[TConcreteComponent] = []
+        self.m_slots: Dict[int, List[int]] = {}
         self.m_memberClass = memberClass
+        self.m_storage: ComponentStorage = memberClass.storage()
+        self.m_version: int = 0
+        self.m_holes: int = 0
+        self.m_tick: int = 0
+        self.m_addedTicks: Dict[TConcreteComponent, int] = {}
+        self.m_changedTicks: Dict[TConcreteComponent, int] = {}
+        self.m_lastChangedTick: int = -1
+        self.m_removedTicks: List[Tuple[int, int]] = []
+        self.m_pool: Optional[List[TConcreteComponent]] = None
+        self.m_poolCapacity: int = 0
+        self.m_poolHits: int = 0
+        self.m_poolMisses: int = 0
+
+    def enablePool(self, capacity: int = 1024) -> None:
+        """Keep up to capacity deleted Components to reuse them on the next creations instead of allocating new
+        ones. Components are reset() when they enter the pool."""
+        if self.m_pool is None:
+            self.m_pool = []
+        self.m_poolCapacity = max(0, capacity)
+        del self.m_pool[self.m_poolCapacity:]
+
+    def disablePool(self) -> None:
+        """Stop reusing deleted Components and drop the pooled ones."""
+        self.m_pool = None
+        self.m_poolCapacity = 0
+
+    @property
+    def poolHits(self) -> int:
+        """Get the amount of creations that reused a pooled Component."""
+        return self.m_poolHits
+
+    @property
+    def poolMisses(self) -> int:
+        """Get the amount of creations that had to allocate a Component while the pool is enabled."""
+        return self.m_poolMisses
+
+    @property
+    def pooledCount(self) -> int:
+        """Get the amount of Components waiting in the pool."""
+        return 0 if self.m_pool is None else len(self.m_pool)
+
+    def __newComponent(self, entity: Entity) -> TConcreteComponent:
+        """Get a Component for an Entity, from the pool if possible."""
+        if self.m_pool is not None:
+            if len(self.m_pool) > 0:
+                self.m_poolHits += 1
+                pooledComponent: TConcreteComponent = self.m_pool.pop()
+                pooledComponent.m_entity = entity
+                return pooledComponent
+
+            self.m_poolMisses += 1
+
+        return self.m_memberClass(entity)
+
+    def __release(self, component: TConcreteComponent) -> None:
+        """Put a deleted Component in the pool if it is enabled and not full."""
+        if self.m_pool is not None and len(self.m_pool) < self.m_poolCapacity:
+            component.reset()
+            self.m_pool.append(component)
 
     def create(self, entity: Entity) -> TConcreteComponent:
         """Create a new Component instance and store it in the ComponentFactory."""
-        newComponent: TConcreteComponent = self.m_memberClass(entity)
+        newComponent: TConcreteComponent = self.__newComponent(entity)
+        newComponent.m_factory = self
+
+        if self.m_storage is ComponentStorage.RUNS:
+            self.__moveRunToEnd(entity.value)
+
+        self.m_slots.setdefault(entity.value, []).append(len(self.m_components))
         self.m_components.append(newComponent)
+        self.m_version += 1
+        self.m_addedTicks[newComponent] = self.m_tick
+        self.m_changedTicks[newComponent] = self.m_tick
+        self.m_lastChangedTick = self.m_tick
         return newComponent
 
+    def createMany(self, entities: [Entity]) -> [TConcreteComponent]:
+        """Create a new Component instance for each of the given Entities and store them in the ComponentFactory."""
+        if self.m_storage is ComponentStorage.RUNS:
+            return [self.create(entity) for entity in entities]
+
+        newComponents: [TConcreteComponent] = [self.__newComponent(entity) for entity in entities]
+        slot: int = len(self.m_components)
+
+        for newComponent in newComponents:
+            newComponent.m_factory = self
+            self.m_slots.setdefault(newComponent.entityValue, []).append(slot)
+            self.m_addedTicks[newComponent] = self.m_tick
+            self.m_changedTicks[newComponent] = self.m_tick
+            slot += 1
+
+        self.m_components.extend(newComponents)
+        self.m_version += 1
+        self.m_lastChangedTick = self.m_tick
+        return newComponents
+
+    @property
+    def tick(self) -> int:
+        """Get the World tick at which the changes are currently recorded."""
+        return self.m_tick
+
+    @tick.setter
+    def tick(self, tick: int) -> None:
+        """Set the World tick at which the changes are recorded."""
+        self.m_tick = tick
+
+    def markChanged(self, component: TConcreteComponent) -> None:
+        """Record that the data of a Component has changed at the current tick."""
+        if component.entityValue not in self.m_slots:
+            return
+
+        # Re-inserting the Component keeps the changes sorted by tick.
+        self.m_changedTicks.pop(component, None)
+        self.m_changedTicks[component] = self.m_tick
+        self.m_lastChangedTick = self.m_tick
+
+    def addedSince(self, tick: int) -> [TConcreteComponent]:
+        """Get the Components created at or after the given tick."""
+        return [component for component, addedTick in list(self.m_addedTicks.items()) if addedTick >= tick]
+
+    def changedSince(self, tick: int) -> [TConcreteComponent]:
+        """Get the Components created or changed at or after the given tick."""
+        return [component for component, changedTick in list(self.m_changedTicks.items()) if changedTick >= tick]
+
+    def hasChangesSince(self, tick: int) -> bool:
+        """Check if Components have been created or changed at or after the given tick, without listing them."""
+        return self.m_lastChangedTick >= tick
+
+    def removedSince(self, tick: int) -> [int]:
+        """Get the values of the Entities whose Components have been deleted at or after the given tick."""
+        return [entityValue for removedTick, entityValue in list(self.m_removedTicks) if removedTick >= tick]
+
+    def pruneChanges(self, tick: int) -> None:
+        """Forget the creations, changes and deletions recorded before the given tick."""
+        for ticks in (self.m_addedTicks, self.m_changedTicks):
+            while len(ticks) > 0:
+                component, recordedTick = next(iter(ticks.items()))
+
+                if recordedTick >= tick:
+                    break
+
+                del ticks[component]
+
+        firstKept: int = 0
+        while firstKept < len(self.m_removedTicks) and self.m_removedTicks[firstKept][0] < tick:
+            firstKept += 1
+        del self.m_removedTicks[:firstKept]
+
+    def slotOf(self, component: TConcreteComponent) -> int:
+        """Get the slot of a Component in the dense list of Components."""
+        slots: [int] = self.m_slots[component.entityValue]
+
+        for slot in slots:
+            if self.m_components[slot] is component:
+                return slot
+
+        raise KeyError("{} is not stored in the ComponentFactory".format(component))
+
+    @property
+    def version(self) -> int:
+        """Get the structural version of the ComponentFactory, changed each time a Component is created or deleted."""
+        return self.m_version
+
     def countComponents(self) -> int:
         """Get the amount of Components for all Entities."""
+        self.compact()
         return len(self.m_components)
 
     def allComponents(self):
         """Get all the Components from all Entities."""
+        self.compact()
         return self.m_components
 
+    def compact(self) -> None:
+        """Remove the holes left in the list of Components by deletions when Components are stored in runs. Done
+        automatically before accessing the whole list; the World also does it before running Jobs so that threads
+        never compact concurrently."""
+        if self.m_holes == 0:
+            return
+
+        self.m_components = [component for component in self.m_components if component is not None]
+        self.m_holes = 0
+        self.__reindex()
+
+    def runOf(self, entityValue: int) -> (int, int):
+        """Get the first slot and the amount of the Components of an Entity stored in runs, (0, 0) if it has none."""
+        slots: [int] = self.m_slots.get(entityValue)
+        return (slots[0], len(slots)) if slots else (0, 0)
+
+    def alignIndex(self, index: int) -> int:
+        """Get the first index, from the given one, that does not split the run of Components of an Entity. Used to
+        split the Components in ranges for the threads."""
+        count: int = len(self.m_components)
+
+        if self.m_storage is not ComponentStorage.RUNS or index <= 0 or index >= count:
+            return min(max(0, index), count)
+
+        previousSlots: [int] = self.m_slots[self.m_components[index - 1].entityValue]
+        return max(index, previousSlots[-1] + 1)
+
     def components(self, entity: Entity) -> [TConcreteComponent]:
         """Get all the Components attached to an Entity."""
-        return [component for component in self.m_components if component.entity == entity]
+        return self.componentsFor(entity.value)
+
+    def componentsFor(self, entityValue: int) -> [TConcreteComponent]:
+        """Get all the Components attached to the Entity of the given value."""
+        slots: [int] = self.m_slots.get(entityValue)
+
+        if slots is None:
+            return []
+
+        if self.m_storage is ComponentStorage.RUNS:
+            return self.m_components[slots[0]:slots[0] + len(slots)]
+
+        return [self.m_components[slot] for slot in slots]
+
+    def componentFor(self, entityValue: int) -> Optional[TConcreteComponent]:
+        """Get the first Component attached to the Entity of the given value, None if there is no such Component."""
+        slots: [int] = self.m_slots.get(entityValue)
+        return self.m_components[slots[0]] if slots else None
+
+    def has(self, entityValue: int) -> bool:
+        """Check if the Entity of the given value bears at least one Component."""
+        return entityValue in self.m_slots
 
     def delete(self, entity: Entity) -> None:
         """Delete the Component instances bearing the entity and remove them from the ComponentFactory."""
-        self.m_components = [component for component in self.m_components if component.entity != entity]
+        self.deleteMany([entity])
+
+    def deleteMany(self, entities: [Entity]) -> None:
+        """Delete the Component instances bearing any of the given Entities and remove them from the
+        ComponentFactory in a single pass."""
+        removedSlots: [int] = []
+
+        for entity in entities:
+            slots: [int] = self.m_slots.pop(entity.value, None)
+
+            if slots is not None:
+                removedSlots.extend(slots)
+                self.m_removedTicks.append((self.m_tick, entity.value))
+
+        if len(removedSlots) == 0:
+            return
+
+        self.m_version += 1
+
+        for slot in removedSlots:
+            removedComponent: TConcreteComponent = self.m_components[slot]
+            self.m_addedTicks.pop(removedComponent, None)
+            self.m_changedTicks.pop(removedComponent, None)
+            self.__release(removedComponent)
+
+        if self.m_storage is ComponentStorage.SPARSE_SET:
+            # Removing the highest slots first never moves a slot that is still to be removed.
+            for slot in sorted(removedSlots, reverse=True):
+                self.__swapRemove(slot)
+        elif self.m_storage is ComponentStorage.RUNS:
+            for slot in removedSlots:
+                self.m_components[slot] = None
+            self.m_holes += len(removedSlots)
+        else:
+            removedSlotSet: {int} = set(removedSlots)
+            self.m_components = [
+                component for slot, component in enumerate(self.m_components) if slot not in removedSlotSet
+            ]
+            self.__reindex()
+
+    def moveSlot(self, fromSlot: int, toSlot: int) -> None:
+        """Move the Component at a slot to another slot, overwriting the Component that was there."""
+        movedComponent: TConcreteComponent = self.m_components[fromSlot]
+        self.m_components[toSlot] = movedComponent
+        movedSlots: [int] = self.m_slots[movedComponent.entityValue]
+        movedSlots[movedSlots.index(fromSlot)] = toSlot
+
+    def __swapRemove(self, slot: int) -> None:
+        """Remove the Component at the given slot by moving the last Component in its place."""
+        lastSlot: int = len(self.m_components) - 1
+
+        if slot != lastSlot:
+            self.moveSlot(lastSlot, slot)
+
+        self.m_components.pop()
+
+    def __moveRunToEnd(self, entityValue: int) -> None:
+        """Move the run of Components of an Entity at the end of the list, if not already there, so that a new
+        Component can be appended to the run. The previous place of the run is left as holes."""
+        slots: [int] = self.m_slots.get(entityValue)
+
+        if not slots or slots[-1] == len(self.m_components) - 1:
+            return
+
+        for index, slot in enumerate(slots):
+            self.m_components.append(self.m_components[slot])
+            self.m_components[slot] = None
+            slots[index] = len(self.m_components) - 1
+
+        self.m_holes += len(slots)
+
+    def __reindex(self) -> None:
+        """Rebuild the Entity -> slots map from the list of Components."""
+        self.m_slots = {}
+
+        for slot, component in enumerate(self.m_components):
+            self.m_slots.setdefault(component.entityValue, []).append(slot)
 
     def debug(self) -> None:
         """Show the content of the ComponentFactory in a terminal."""
+        self.compact()
         print(colored("[Debug] {}Factory: it contains {} components".format(
                 self.m_memberClass.__name__,
                 len(self.m_components)
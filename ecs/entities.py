@@ -2,52 +2,105 @@ from termcolor import colored
 
 
 class Entity:
-    """Obscur ID type for an Entity."""
+    """Obscur ID type for an Entity. Its value packs an index, reused once the Entity is freed, and the generation of
+    that index, so that a value kept after the Entity was freed never matches the Entity that reuses the index."""
+
+    __slots__ = ('m_value',)
 
     # Class members.
+    IndexBits: int = 24
+    IndexMask: int = (1 << IndexBits) - 1
     CurrentID: int = 0
-    AvailableIDs: set = set()
+    AvailableIDs: [int] = []
+    Generations: [int] = []
 
     # Object methods.
     def __init__(self, value: int) -> None:
         """Creation of a new ID instance."""
         self.m_value: int = value
 
-    def __del__(self) -> None:
-        """Destruction of the ID instance."""
-        self.m_value = None
-
     @property
     def isValid(self) -> bool:
         """Check if the ID is valid (ie. with a defined value) or not (None)."""
         return self.m_value is not None
 
+    @property
+    def isAlive(self) -> bool:
+        """Check if the ID is valid and has not been freed since it was generated."""
+        return self.m_value is not None and Entity.IsAlive(self.m_value)
+
     @property
     def value(self) -> int:
         """Get the value of an ID."""
         return self.m_value
 
+    @property
+    def index(self) -> int:
+        """Get the index part of the value of an ID."""
+        return self.m_value & Entity.IndexMask
+
+    @property
+    def generation(self) -> int:
+        """Get the generation part of the value of an ID."""
+        return self.m_value >> Entity.IndexBits
+
     # Class methods.
+    @staticmethod
+    def Pack(index: int, generation: int) -> int:
+        """Pack an index and a generation into an ID value."""
+        return (generation << Entity.IndexBits) | index
+
+    @staticmethod
+    def IsAlive(value: int) -> bool:
+        """Check if an ID value is the one of a generated Entity that has not been freed yet."""
+        index: int = value & Entity.IndexMask
+        return index < len(Entity.Generations) and Entity.Generations[index] == value >> Entity.IndexBits
+
     @staticmethod
     def Generate() -> 'Entity':
         """Generate a new ID either by incrementing the CurrentID or getting an
-        ID from the AvailableIDs list."""
+        index from the AvailableIDs free list."""
         if len(Entity.AvailableIDs) == 0:
-            newID = Entity.CurrentID
+            if Entity.CurrentID > Entity.IndexMask:
+                raise OverflowError("No more ID available ({} alive)".format(Entity.CurrentID))
+
+            index: int = Entity.CurrentID
             Entity.CurrentID += 1
-            return Entity(newID)
+            Entity.Generations.append(0)
         else:
-            return Entity(Entity.AvailableIDs.pop())
+            index: int = Entity.AvailableIDs.pop()
+
+        return Entity(Entity.Pack(index, Entity.Generations[index]))
+
+    @staticmethod
+    def GenerateMany(count: int) -> ['Entity']:
+        """Generate several new IDs, reusing the indices of the AvailableIDs free list first."""
+        reusedCount: int = min(count, len(Entity.AvailableIDs))
+        newCount: int = count - reusedCount
+
+        if Entity.CurrentID + newCount > Entity.IndexMask + 1:
+            raise OverflowError("No more ID available ({} alive)".format(Entity.CurrentID))
+
+        indices: [int] = Entity.AvailableIDs[len(Entity.AvailableIDs) - reusedCount:]
+        del Entity.AvailableIDs[len(Entity.AvailableIDs) - reusedCount:]
+        indices.extend(range(Entity.CurrentID, Entity.CurrentID + newCount))
+        Entity.CurrentID += newCount
+        Entity.Generations.extend([0] * newCount)
+
+        generations: [int] = Entity.Generations
+        return [Entity(Entity.Pack(index, generations[index])) for index in indices]
 
     @staticmethod
     def Free(entity: 'Entity') -> None:
-        """Free an ID by keeping its value in AvailableIDs and setting it to
+        """Free an ID by bumping the generation of its index, keeping the index in AvailableIDs and setting it to
         None, making it invalid."""
-        if not entity.m_value in Entity.AvailableIDs:
-            Entity.AvailableIDs.add(entity.m_value)
+        if entity.m_value is not None and Entity.IsAlive(entity.m_value):
+            index: int = entity.index
+            Entity.Generations[index] += 1
+            Entity.AvailableIDs.append(index)
             entity.m_value = None
         else:
-            raise ValueError("ID already used! {}".format(Entity.AvailableIDs))
+            raise ValueError("ID already freed! {}".format(entity))
 
     # Operators and converters.
     def __eq__(self, other) -> bool:
@@ -60,7 +113,9 @@ class Entity:
 
     def __str__(self):
         """Convert the current ID to string representation"""
-        return "EntityID #{}".format(self.m_value)
+        if self.m_value is None:
+            return "EntityID #None"
+        return "EntityID #{}.{}".format(self.index, self.generation)
 
 
 class EntityFactory:
@@ -68,27 +123,34 @@ class EntityFactory:
 
     def __init__(self) -> None:
         """Create a new EntityFactory instance. There should be only one EntityFactory in a application."""
-        self.m_entities: [int] = []
+        self.m_entities: {int} = set()
 
     def create(self) -> Entity:
         """Create a new Entity instance and store it in the EntityFactory."""
         newEntity: Entity = Entity.Generate()
-        self.m_entities.append(newEntity.value)
-        self.m_entities.sort()
+        self.m_entities.add(newEntity.value)
         return newEntity
 
+    def createMany(self, count: int) -> [Entity]:
+        """Create several new Entity instances and store them in the EntityFactory."""
+        newEntities: [Entity] = Entity.GenerateMany(count)
+        self.m_entities.update(entity.value for entity in newEntities)
+        return newEntities
+
     def delete(self, entity: Entity) -> None:
         """Delete an Entity instance and remove it from the EntityFactory."""
-        try:
+        if entity.value in self.m_entities:
             self.m_entities.remove(entity.value)
             Entity.Free(entity)
-        except:
-            return
 
     def has(self, entity: Entity) -> bool:
         """Check if the given Entity exists."""
         return entity.value in self.m_entities
 
+    def hasValue(self, entityValue: int) -> bool:
+        """Check if an Entity of the given value exists."""
+        return entityValue in self.m_entities
+
     def debug(self) -> None:
         """Show the content of the EntityFactory in a terminal."""
-        print(colored("[Debug] EntityFactory: {}".format(self.m_entities), 'green'))
+        print(colored("[Debug] EntityFactory: {}".format(sorted(self.m_entities)), 'green'))
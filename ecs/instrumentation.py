@@ -0,0 +1,97 @@
+import json
+import numpy
+import os
+import threading
+from collections import deque
+
+
+class FrameRecorder:
+    """Records the durations of the frames, Jobs, Systems (per worker thread) and waits at the end of the Jobs in a
+    ring buffer, when enabled. Events are (name, category, thread id, start time, end time), times being given by
+    time.perf_counter."""
+
+    def __init__(self, capacity: int = 65536) -> None:
+        """Create a new FrameRecorder instance, disabled, keeping the last capacity events."""
+        self.m_enabled: bool = False
+        self.m_events: deque = deque(maxlen=capacity)
+
+    def enable(self) -> None:
+        """Start recording events."""
+        self.m_enabled = True
+
+    def disable(self) -> None:
+        """Stop recording events, keeping the recorded ones."""
+        self.m_enabled = False
+
+    @property
+    def enabled(self) -> bool:
+        """Check if events are recorded, which callers check before measuring anything."""
+        return self.m_enabled
+
+    def record(self, name: str, category: str, startTime: float, endTime: float, thread: int = None) -> None:
+        """Record an event, for the current thread by default."""
+        self.m_events.append((name, category, thread or threading.get_ident(), startTime, endTime))
+
+    def clear(self) -> None:
+        """Forget the recorded events."""
+        self.m_events.clear()
+
+    @property
+    def events(self) -> [(str, str, int, float, float)]:
+        """Get the recorded events, from the oldest one."""
+        return list(self.m_events)
+
+    def stats(self, category: str = None) -> {str, dict}:
+        """Get, per event name (of the given category if any), the amount of recorded events and the mean, median,
+        90th and 99th percentiles and maximum of their durations (in seconds)."""
+        durations: {str, [float]} = {}
+
+        for name, eventCategory, thread, startTime, endTime in list(self.m_events):
+            if category is None or eventCategory == category:
+                durations.setdefault(name, []).append(endTime - startTime)
+
+        stats: {str, {str, float}} = {}
+
+        for name, values in durations.items():
+            p50, p90, p99 = numpy.percentile(values, [50, 90, 99])
+            stats[name] = {
+                'count': len(values),
+                'mean': float(numpy.mean(values)),
+                'p50': float(p50),
+                'p90': float(p90),
+                'p99': float(p99),
+                'max': float(numpy.max(values))
+            }
+
+        return stats
+
+    def exportChromeTrace(self, path: str) -> None:
+        """Write the recorded events in the Trace Event JSON format, read by chrome://tracing and Perfetto."""
+        processId: int = os.getpid()
+        threadNames: {int, str} = {thread.ident: thread.name for thread in threading.enumerate()}
+        traceEvents: [dict] = []
+        threads: {int} = set()
+
+        for name, category, thread, startTime, endTime in list(self.m_events):
+            threads.add(thread)
+            traceEvents.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': startTime * 1e6,
+                'dur': (endTime - startTime) * 1e6,
+                'pid': processId,
+                'tid': thread
+            })
+
+        for thread in sorted(threads):
+            traceEvents.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': processId,
+                'tid': thread,
+                'args': {'name': threadNames.get(thread, str(thread))}
+            })
+
+        with open(path, 'w') as traceFile:
+            json.dump({'traceEvents': traceEvents, 'displayTimeUnit': 'ms'}, traceFile)
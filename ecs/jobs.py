@@ -1,148 +1,315 @@
-import random
+import math
 import threading
+import time
+from concurrent.futures import Future
+from enum import Enum
+from ecs.commands import CommandBuffer
 from ecs.entities import Entity
+from ecs.instrumentation import FrameRecorder
+from ecs.processes import ProcessPool
+from ecs.profiling import SamplingProfiler
 from ecs.systems import System
+from ecs.workers import WorkerPool
 
-class ThreadJob(threading.Thread):
-    """A thread for running Job."""
 
-    def __init__(
-        self,
-        condition: threading.Condition,
-        syncBarrier: threading.Barrier
-    ) -> None:
-        """Create a new ThreadJob instance."""
-        threading.Thread.__init__(self)
-        self.m_condition: threading.Condition = condition
-        self.m_syncBarrier: threading.Barrier = syncBarrier
-        self.m_continue: bool = True
-        self.m_systems: {System} = {}
-        self.m_fromToComponents: {System, [int, int]} = {}
-        self.m_dropEntities: [Entity] = []
+class JobBackend(Enum):
+    """Where the tasks of a Job are run."""
+    # Threads of the WorkerPool of the World.
+    THREADS = 0
+    # Worker processes of the ProcessPool of the World for the Systems whose processing implements RunColumns on
+    # ColumnarComponents (whose columns are then shared), threads of the WorkerPool for the other ones.
+    PROCESSES = 1
 
-    def setProcessedSystems(self, systems: [System]) -> None:
-        """Add a System to be processed by the ThreadJob."""
-        self.m_systems = dict.fromkeys(systems)
 
-    def setFromToComponents(self, system: System, fromIndex: int, toIndex: int) -> None:
-        """Set the limits of execution of the thread for each System."""
-        if system in self.m_systems:
-            self.m_fromToComponents[system] = [fromIndex, toIndex]
+class JobTask:
+    """A chunk of a Job, run by any worker of the WorkerPool: it processes a System in an index range. Structural
+    changes are recorded in the CommandBuffer of the chunk, whose order is the one of the chunk in the Job, so that
+    they do not depend on the worker running it."""
 
-    def stop(self) -> None:
-        """Stop the thread as soon as possible."""
-        self.m_continue = False
+    def __init__(self, order: int = 0) -> None:
+        """Create a new JobTask instance."""
+        self.m_system: System = None
+        self.m_fromIndex: int = 0
+        self.m_toIndex: int = 0
+        self.m_commands: CommandBuffer = CommandBuffer(order)
+        self.m_startTime: float = 0.0
+        self.m_endTime: float = 0.0
+        self.m_worker: int = 0
 
-    def run(self) -> None:
-        """Method representing the thread’s activity. Inherited from the parent class Thread."""
-        while self.m_continue:
-            with self.m_condition:
-                self.m_condition.wait()
-            self.processSystems()
-            self.m_syncBarrier.wait()
+    def setFromToComponents(self, system: System, fromIndex: int, toIndex: int) -> None:
+        """Set the System processed by the task and its limits of execution."""
+        self.m_system = system
+        self.m_fromIndex = fromIndex
+        self.m_toIndex = toIndex
 
     def processSystems(self) -> None:
-        """Process the systems in the component index bounds."""
-        self.m_dropEntities.clear()
+        """Process the System in the component index bounds, measuring the time it takes."""
+        self.m_commands.clear()
+        CommandBuffer.SetCurrent(self.m_commands)
+        SamplingProfiler.SetCurrentSystem(self.m_system.name)
+        self.m_startTime = time.perf_counter()
 
-        for system in self.m_fromToComponents:
-            fromIndex: int = self.m_fromToComponents[system][0]
-            toIndex: int = self.m_fromToComponents[system][1]
-            system.process(fromIndex, toIndex)
-            self.m_dropEntities.extend(system.processing.dropEntities)
+        try:
+            self.m_system.process(self.m_fromIndex, self.m_toIndex)
+        finally:
+            CommandBuffer.SetCurrent(None)
+            SamplingProfiler.SetCurrentSystem(None)
+            self.m_endTime = time.perf_counter()
+            self.m_worker = threading.get_ident()
 
     @property
-    def dropEntities(self) -> [Entity]:
-        """Get the Entities to be removed"""
-        return self.m_dropEntities
+    def system(self) -> System:
+        """Get the System processed by the task."""
+        return self.m_system
+
+    @property
+    def amountComponents(self) -> int:
+        """Get the amount of Components (or Query tuples) processed by the task."""
+        return self.m_toIndex - self.m_fromIndex
+
+    @property
+    def duration(self) -> float:
+        """Get the time (in seconds) of the last processing."""
+        return self.m_endTime - self.m_startTime
+
+    @property
+    def commands(self) -> CommandBuffer:
+        """Get the structural changes recorded during the last processing."""
+        return self.m_commands
 
 
 class Job:
-    """A Job groups systems that can run in parallel and threads to execute them."""
+    """A Job groups systems that can run in parallel, in cost-tuned chunks pulled by the workers of a WorkerPool."""
 
-    def __init__(self, name: str, systems: [System], threadCount) -> None:
-        """Create a new Job."""
+    # Time (in seconds) aimed for the processing of a chunk: smaller chunks balance the load better but cost more to
+    # dispatch.
+    ChunkDuration: float = 0.001
+    # Maximal amount of chunks per System, as a factor of the thread count of the Job.
+    ChunksPerThread: int = 4
+    # Weight of the last frame in the average processing time per Component of a System.
+    CostSmoothing: float = 0.25
+
+    def __init__(
+        self,
+        name: str,
+        systems: [System],
+        taskCount: int,
+        pool: WorkerPool,
+        processes: ProcessPool = None,
+        recorder: FrameRecorder = None
+    ) -> None:
+        """Create a new Job. If a ProcessPool is given, the Job uses the JobBackend.PROCESSES backend. The timings
+        of the executions are recorded in the FrameRecorder, if any, while it is enabled."""
         self.m_name: str = name
-        self.m_condition: threading.Condition = threading.Condition()
-        self.m_syncBarrier: threading.Barrier = threading.Barrier(threadCount + 1)
+        self.m_pool: WorkerPool = pool
+        self.m_processes: ProcessPool = processes
+        self.m_recorder: FrameRecorder = recorder
+        self.m_taskCount: int = taskCount
         self.m_systems: [System] = list(dict.fromkeys(systems))
-        self.m_threads: [ThreadJob] = []
+        self.m_processSystems: [System] = []
+        self.m_processRanges: [(System, int, int)] = []
+        self.m_tasks: [JobTask] = []
+        self.m_amountTasks: int = 0
+        self.m_costs: {System, float} = {}
         self.m_dropEntities: [Entity] = []
-        self.__createThreads(threadCount)
-        self.__startThreads()
+        self.m_executionTime: float = 0.0
+        self.m_barrierWaitTime: float = 0.0
+        self.m_stopped: bool = False
+        self.__shareColumns()
 
-    def execute(self) -> None:
-        """Execute the Job tasks."""
+    def execute(self, systems: [System] = None) -> None:
+        """Execute the Job tasks on the WorkerPool and wait for all of them to be done. Only the given Systems of
+        the Job are run if any (eg. the ones due at the current simulation step)."""
         self.m_dropEntities.clear()
-        self.__defineThreadsCharge()
 
-        # Make the threads run their loop.
-        with self.m_condition:
-            self.m_condition.notifyAll()
+        if self.m_stopped:
+            return
+
+        systems = self.m_systems if systems is None else [system for system in self.m_systems if system in systems]
+
+        for system in systems:
+            system.processing.dropEntities.clear()
+
+        self.__defineThreadsCharge(systems)
+        startTime: float = time.perf_counter()
+
+        # Processes work on the shared columns while the threads run the other Systems.
+        futures: [(System, Future)] = self.__submitProcessRanges()
+        self.m_pool.runAll([task.processSystems for task in self.m_tasks[:self.m_amountTasks]])
 
-        # Wait all threads have done their loop.
-        self.m_syncBarrier.wait()
+        for system, future in futures:
+            system.processing.dropSlots(future.result())
+
+        self.__measure(startTime, time.perf_counter())
 
         # Fill the drop entities list.
-        for thread in self.m_threads:
-            self.m_dropEntities.extend(thread.dropEntities)
+        for system in systems:
+            self.m_dropEntities.extend(system.processing.dropEntities)
 
     def stop(self) -> None:
-        """Stop the Job and all its threads."""
-        for thread in self.m_threads:
-            thread.stop()
+        """Stop the Job: it is not executed anymore. The workers belong to the WorkerPool of the World. The columns
+        shared with the worker processes are moved back to private memory."""
+        self.m_stopped = True
+
+        for system in self.m_processSystems:
+            system.factory.releaseSharedColumns()
+
+    @property
+    def backend(self) -> JobBackend:
+        """Get where the tasks of the Job are run."""
+        return JobBackend.THREADS if self.m_processes is None else JobBackend.PROCESSES
 
     @property
     def dropEntity(self) -> []:
         """Get the Entities that the World should delete."""
         return self.m_dropEntities
 
+    @property
+    def systems(self) -> [System]:
+        """Get the Systems run by the Job."""
+        return self.m_systems
+
+    @property
+    def commandBuffers(self) -> [CommandBuffer]:
+        """Get the structural changes recorded by the tasks, that the World should apply."""
+        return [task.commands for task in self.m_tasks[:self.m_amountTasks]]
+
+    @property
+    def amountTasks(self) -> int:
+        """Get the amount of chunks run by the threads during the last execution."""
+        return self.m_amountTasks
+
+    @property
+    def executionTime(self) -> float:
+        """Get the time (in seconds) of the last execution, from the submission of the chunks to the end of the last
+        one."""
+        return self.m_executionTime
+
+    @property
+    def barrierWaitTime(self) -> float:
+        """Get the time (in seconds) the workers spent waiting for the last chunks of the last execution to be done,
+        once they had no more chunk to run, summed over the workers."""
+        return self.m_barrierWaitTime
+
+    def costPerComponent(self, system: System) -> float:
+        """Get the average processing time (in seconds) of a Component of a System, None if not measured yet."""
+        return self.m_costs.get(system)
+
     @property
     def name(self) -> str:
         """Get the name of the Job."""
         return self.m_name
 
-    def __createThreads(self, threadCount: int ) -> None:
-        """Create the threads of the Job."""
-        for index in range(0, threadCount):
-            newThread: ThreadJob = ThreadJob(self.m_condition, self.m_syncBarrier)
-            self.m_threads.append(newThread)
+    def __shareColumns(self) -> None:
+        """Select the Systems run by the worker processes and share their columns with them."""
+        if self.m_processes is None:
+            return
 
-    def __startThreads(self) -> None:
-        """Start the threads of the Job."""
-        for thread in self.m_threads:
-            thread.setProcessedSystems(self.m_systems)
-            thread.start()
+        for system in self.m_systems:
+            if system.processing.runsOnColumns() and hasattr(system.factory, 'shareColumns'):
+                system.factory.shareColumns()
+                self.m_processSystems.append(system)
 
-    def __defineThreadsCharge(self):
-        """Define the work load for each thread on each system."""
-        amountThreads: int = len(self.m_threads)
-        threadCharge: {System, []} = {}
+    def __submitProcessRanges(self) -> '[(System, Future)]':
+        """Submit the index ranges of the Systems run by worker processes."""
+        return [
+            (
+                system,
+                self.m_processes.submit(
+                    type(system.processing).RunColumns,
+                    system.name,
+                    system.factory.sharedColumns,
+                    fromIndex,
+                    toIndex
+                )
+            )
+            for system, fromIndex, toIndex in self.m_processRanges if system.processing.shouldRun()
+        ]
 
-        for system in self.m_systems:
-            amountComponents: int = system.amountComponents
+    def __amountChunks(self, system: System, amountComponents: int) -> int:
+        """Get the amount of chunks in which the Components of a System are split."""
+        if not system.multithreadable or amountComponents == 0:
+            return 1
 
-            if system.multithreadable:
-                amountComponentsPerThread: int = int(amountComponents / amountThreads)
-                extraAmountComponents: int = int(amountComponents % amountThreads)
-                threadIndexWithExtra: int = random.randrange(0, amountThreads)
-                threadCharge[system] = [amountComponentsPerThread] * amountThreads
-                threadCharge[system][threadIndexWithExtra] = amountComponentsPerThread + extraAmountComponents
-            else:
-                threadCharge[system] = [amountComponents]
+        maxChunks: int = self.m_taskCount * Job.ChunksPerThread
+        cost: float = self.m_costs.get(system)
 
-        for system in threadCharge:
+        if cost is None:
+            amountChunks: int = self.m_taskCount
+        else:
+            amountChunks: int = math.ceil(cost * amountComponents / Job.ChunkDuration)
+
+        return max(1, min(amountChunks, maxChunks, amountComponents))
+
+    def __defineThreadsCharge(self, systems: [System]):
+        """Split the Components of each System in chunks. Chunks of the Systems that cannot be split are run first,
+        as they are the longest ones."""
+        self.m_amountTasks = 0
+        self.m_processRanges.clear()
+
+        for system in sorted(systems, key=lambda system: system.multithreadable):
+            amountComponents: int = system.amountComponents
+            amountChunks: int = self.__amountChunks(system, amountComponents)
             fromIndex: int = 0
-            toIndex: int = 0
-            amountsComponentsPerThread: int = threadCharge[system]
-            amountThreadsForSystem: int = len(threadCharge[system])
-
-            for threadIndex in range(amountThreadsForSystem):
-                thread: ThreadJob = self.m_threads[threadIndex]
-                amountComponentsForThread: int = amountsComponentsPerThread[threadIndex]
-                toIndex = toIndex + amountComponentsForThread
-                thread.setFromToComponents(system, fromIndex, toIndex)
-                fromIndex = fromIndex + amountComponentsForThread
+
+            for chunkIndex in range(amountChunks):
+                toIndex: int = system.alignIndex(amountComponents * (chunkIndex + 1) // amountChunks)
+
+                if toIndex <= fromIndex and amountComponents > 0:
+                    continue
+
+                if system in self.m_processSystems:
+                    self.m_processRanges.append((system, fromIndex, toIndex))
+                else:
+                    self.__nextTask().setFromToComponents(system, fromIndex, toIndex)
+
+                fromIndex = toIndex
+
+    def __nextTask(self) -> JobTask:
+        """Get the next chunk of the current execution, reusing the ones of the previous executions."""
+        if self.m_amountTasks == len(self.m_tasks):
+            self.m_tasks.append(JobTask(self.m_amountTasks))
+
+        task: JobTask = self.m_tasks[self.m_amountTasks]
+        self.m_amountTasks += 1
+        return task
+
+    def __measure(self, startTime: float, endTime: float) -> None:
+        """Update the processing times per Component of the Systems and the waiting time of the workers with the
+        timings of the chunks of the last execution."""
+        durations: {System, float} = {}
+        amounts: {System, int} = {}
+        lastEndTimes: {int, float} = {}
+
+        for task in self.m_tasks[:self.m_amountTasks]:
+            durations[task.system] = durations.get(task.system, 0.0) + task.duration
+            amounts[task.system] = amounts.get(task.system, 0) + task.amountComponents
+            lastEndTimes[task.m_worker] = max(lastEndTimes.get(task.m_worker, 0.0), task.m_endTime)
+
+        for system, duration in durations.items():
+            if amounts[system] == 0:
+                continue
+
+            cost: float = duration / amounts[system]
+            previousCost: float = self.m_costs.get(system, cost)
+            self.m_costs[system] = previousCost + Job.CostSmoothing * (cost - previousCost)
+
+        self.m_executionTime = endTime - startTime
+        self.m_barrierWaitTime = sum(endTime - lastEndTime for lastEndTime in lastEndTimes.values())
+
+        if self.m_recorder is not None and self.m_recorder.enabled:
+            self.__record(startTime, endTime, lastEndTimes)
+
+    def __record(self, startTime: float, endTime: float, lastEndTimes: {int, float}) -> None:
+        """Record the timings of the Job, of its chunks per worker and of the waits of the workers for the last
+        chunks."""
+        self.m_recorder.record(self.m_name, 'job', startTime, endTime)
+
+        for task in self.m_tasks[:self.m_amountTasks]:
+            self.m_recorder.record(task.system.name, 'system', task.m_startTime, task.m_endTime, task.m_worker)
+
+        for worker, lastEndTime in lastEndTimes.items():
+            self.m_recorder.record('barrier', 'wait', lastEndTime, endTime, worker)
 
     def __str__(self) -> str:
         """Convert the Job to string."""
@@ -0,0 +1,97 @@
+import multiprocessing
+import multiprocessing.util
+import numpy
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
+class ColumnsAttachment:
+    """Shared memory blocks of columns attached by a worker process. Blocks stay attached between frames and are only
+    replaced when the columns have been reallocated under a new name."""
+
+    Blocks: {(str, str), (shared_memory.SharedMemory, numpy.ndarray)} = {}
+
+    @staticmethod
+    def Attach(owner: str, columns: {str, (str, str, int)}) -> {str, numpy.ndarray}:
+        """Get the arrays of the shared columns of an owner (eg. a ComponentFactory), described as
+        {name: (shared memory block name, dtype, capacity)}."""
+        arrays: {str, numpy.ndarray} = {}
+
+        if len(ColumnsAttachment.Blocks) == 0:
+            # Arrays must be released before their blocks are closed, which the garbage collector does not ensure.
+            multiprocessing.util.Finalize(None, ColumnsAttachment.DetachAll, exitpriority=10)
+
+        for name, (blockName, dtype, capacity) in columns.items():
+            attached: tuple = ColumnsAttachment.Blocks.get((owner, name))
+
+            if attached is None or attached[0].name != blockName or len(attached[1]) != capacity:
+                if attached is not None:
+                    attached = None
+                    ColumnsAttachment.Detach(ColumnsAttachment.Blocks.pop((owner, name)))
+
+                block: shared_memory.SharedMemory = shared_memory.SharedMemory(name=blockName)
+                attached = (block, numpy.frombuffer(block.buf, dtype=numpy.dtype(dtype), count=capacity))
+                ColumnsAttachment.Blocks[(owner, name)] = attached
+
+            arrays[name] = attached[1]
+
+        return arrays
+
+    @staticmethod
+    def Detach(attached: (shared_memory.SharedMemory, numpy.ndarray)) -> None:
+        """Close a block that is not used anymore by the worker process."""
+        block: shared_memory.SharedMemory = attached[0]
+        attached = None
+
+        try:
+            block.close()
+        except BufferError:
+            pass
+
+    @staticmethod
+    def DetachAll() -> None:
+        """Close all the blocks attached by the worker process."""
+        while len(ColumnsAttachment.Blocks) > 0:
+            ColumnsAttachment.Detach(ColumnsAttachment.Blocks.popitem()[1])
+
+    @staticmethod
+    def RunColumns(function: 'function', owner: str, columns: {str, (str, str, int)}, fromIndex: int, toIndex: int):
+        """Run a function on shared columns in a worker process and return its result."""
+        return function(ColumnsAttachment.Attach(owner, columns), fromIndex, toIndex)
+
+
+class ProcessPool:
+    """Worker processes shared by the Jobs of a World using the JobBackend.PROCESSES backend. The processes are
+    spawned (not forked, as the World also runs threads) once and reused for every frame: only the description of
+    the shared columns and the index ranges are sent to them."""
+
+    def __init__(self, workerCount: int = None) -> None:
+        """Create a new ProcessPool instance, with as many worker processes as cores by default."""
+        self.m_workerCount: int = max(1, workerCount or os.cpu_count() or 1)
+        self.m_executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=self.m_workerCount,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+    def submit(
+        self,
+        function: 'function',
+        owner: str,
+        columns: {str, (str, str, int)},
+        fromIndex: int,
+        toIndex: int
+    ) -> Future:
+        """Run a function (a module or class level one, so that it can be sent to the processes) on the given
+        index range of shared columns, in a worker process. The function is called with the arrays of the columns
+        and the index range."""
+        return self.m_executor.submit(ColumnsAttachment.RunColumns, function, owner, columns, fromIndex, toIndex)
+
+    def stop(self) -> None:
+        """Stop the worker processes once the submitted functions are done."""
+        self.m_executor.shutdown(wait=True)
+
+    @property
+    def workerCount(self) -> int:
+        """Get the amount of worker processes."""
+        return self.m_workerCount
@@ -0,0 +1,118 @@
+import os
+import sys
+import threading
+import time
+
+
+class SamplingProfiler:
+    """Sampling profiler writing the stacks of the threads of the process, tagged with their System, as collapsed
+    stacks."""
+
+    # System processed by each thread (by thread id), set by the Job tasks while a profiler is running.
+    CurrentSystems: {int, str} = {}
+    AmountRunning: int = 0
+
+    def __init__(self, interval: float = 0.005, maxDepth: int = 64) -> None:
+        """Create a new SamplingProfiler instance, taking a sample every interval seconds, of at most maxDepth
+        frames per stack."""
+        self.m_interval: float = interval
+        self.m_maxDepth: int = maxDepth
+        self.m_counts: {(str, ...), int} = {}
+        self.m_amountSamples: int = 0
+        self.m_thread: threading.Thread = None
+        self.m_running: threading.Event = threading.Event()
+
+    @staticmethod
+    def SetCurrentSystem(systemName: str) -> None:
+        """Tag the samples of the current thread with the given System name, None to remove the tag. Does nothing
+        when no profiler is running."""
+        if SamplingProfiler.AmountRunning == 0:
+            return
+
+        if systemName is None:
+            SamplingProfiler.CurrentSystems.pop(threading.get_ident(), None)
+        else:
+            SamplingProfiler.CurrentSystems[threading.get_ident()] = systemName
+
+    def start(self) -> None:
+        """Start sampling the threads."""
+        if self.m_thread is not None:
+            return
+
+        self.m_running.set()
+        SamplingProfiler.AmountRunning += 1
+        self.m_thread = threading.Thread(target=self.__sampleLoop, name="ecs-profiler", daemon=True)
+        self.m_thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling the threads, keeping the samples."""
+        if self.m_thread is None:
+            return
+
+        self.m_running.clear()
+        self.m_thread.join()
+        self.m_thread = None
+        SamplingProfiler.AmountRunning -= 1
+
+        if SamplingProfiler.AmountRunning == 0:
+            SamplingProfiler.CurrentSystems.clear()
+
+    def clear(self) -> None:
+        """Forget the samples."""
+        self.m_counts = {}
+        self.m_amountSamples = 0
+
+    @property
+    def amountSamples(self) -> int:
+        """Get the amount of samples taken (one per sampling and per thread)."""
+        return self.m_amountSamples
+
+    def collapsed(self, threadName: str = None) -> {str, int}:
+        """Get the amount of samples per collapsed stack ('thread;system;outer function;...;inner function'), of
+        all the threads or of the one of the given name."""
+        stacks: {str, int} = {}
+
+        for stack, count in list(self.m_counts.items()):
+            if threadName is None or stack[0] == threadName:
+                line: str = ";".join(stack)
+                stacks[line] = stacks.get(line, 0) + count
+
+        return stacks
+
+    def writeCollapsed(self, path: str, threadName: str = None) -> None:
+        """Write the collapsed stacks of all the threads, or of the one of the given name, to a file."""
+        with open(path, 'w') as collapsedFile:
+            for stack, count in sorted(self.collapsed(threadName).items()):
+                collapsedFile.write("{} {}\n".format(stack, count))
+
+    def __sampleLoop(self) -> None:
+        """Loop of the sampling thread."""
+        while self.m_running.is_set():
+            self.__sample()
+            time.sleep(self.m_interval)
+
+    def __sample(self) -> None:
+        """Take the stacks of all the threads except the sampling one."""
+        ownThread: int = threading.get_ident()
+        threadNames: {int, str} = {thread.ident: thread.name for thread in threading.enumerate()}
+
+        for thread, frame in sys._current_frames().items():
+            if thread == ownThread:
+                continue
+
+            functions: [str] = []
+
+            while frame is not None and len(functions) < self.m_maxDepth:
+                code = frame.f_code
+                functions.append("{} ({}:{})".format(
+                    code.co_name,
+                    os.path.basename(code.co_filename),
+                    code.co_firstlineno
+                ).replace(";", ","))
+                frame = frame.f_back
+
+            systemName: str = SamplingProfiler.CurrentSystems.get(thread, "-")
+            stack: (str, ...) = (threadNames.get(thread, str(thread)), "system:" + systemName)
+            stack += tuple(reversed(functions))
+            self.m_counts[stack] = self.m_counts.get(stack, 0) + 1
+            self.m_amountSamples += 1
@@ -0,0 +1,97 @@
+import numpy
+from typing import Optional
+from ecs.components import Component, ComponentFactory
+from ecs.signatures import EntitySignatures
+
+
+class Query:
+    """Aligned tuples of Components for the Entities bearing a Component of each type of a signature. The tuples are
+    cached and only rebuilt when one of the ComponentFactories has been structurally changed (creation or deletion of
+    Components), which is checked by refresh(). With EntitySignatures, the Entities are matched with vectorized
+    bitmask operations and can be filtered on tags (or Component types) to include or exclude."""
+
+    def __init__(
+        self,
+        factories: [ComponentFactory],
+        signatures: EntitySignatures = None,
+        requiredMask: int = 0,
+        excludedMask: int = 0
+    ) -> None:
+        """Create a new Query instance on the factories of the Component types of the signature, in signature order."""
+        self.m_factories: [ComponentFactory] = factories
+        self.m_signatures: EntitySignatures = signatures
+        self.m_requiredMask: int = requiredMask
+        self.m_excludedMask: int = excludedMask
+        self.m_versions: (int, ...) = None
+        self.m_rows: [(Component, ...)] = []
+        self.m_entityValues: [int] = []
+        self.m_entityRows: {int, int} = {}
+
+    def refresh(self) -> None:
+        """Rebuild the cached tuples if one of the ComponentFactories has changed since the last rebuild."""
+        versions: (int, ...) = tuple(factory.version for factory in self.m_factories)
+
+        if self.m_signatures is not None:
+            versions += (self.m_signatures.version,)
+
+        if versions == self.m_versions:
+            return
+
+        # Drive the matching with the smallest ComponentFactory.
+        drivingFactory: ComponentFactory = min(self.m_factories, key=ComponentFactory.countComponents)
+        candidates: [int] = [component.entityValue for component in drivingFactory.allComponents()]
+        rows: [(Component, ...)] = []
+        entityValues: [int] = []
+        entityRows: {int, int} = {}
+
+        if self.m_signatures is not None and len(candidates) > 0:
+            matching: numpy.ndarray = self.m_signatures.matches(candidates, self.m_requiredMask, self.m_excludedMask)
+            candidates = numpy.asarray(candidates, dtype=numpy.int64)[matching].tolist()
+
+        for entityValue in candidates:
+            if entityValue in entityRows:
+                continue
+
+            row: (Component, ...) = tuple(factory.componentFor(entityValue) for factory in self.m_factories)
+
+            if None not in row:
+                entityRows[entityValue] = len(rows)
+                entityValues.append(entityValue)
+                rows.append(row)
+
+        self.m_rows = rows
+        self.m_entityValues = entityValues
+        self.m_entityRows = entityRows
+        self.m_versions = versions
+
+    def rowFor(self, entityValue: int) -> Optional[tuple]:
+        """Get the tuple of Components of the Entity of the given value, None if it does not match the Query."""
+        rowIndex: int = self.m_entityRows.get(entityValue)
+        return None if rowIndex is None else self.m_rows[rowIndex]
+
+    @property
+    def componentClasses(self) -> [type]:
+        """Get the Component types of the tuples."""
+        return [factory.m_memberClass for factory in self.m_factories]
+
+    @property
+    def rows(self) -> [tuple]:
+        """Get the tuples of Components. The list is replaced, not modified, when the Query is rebuilt."""
+        return self.m_rows
+
+    def entities(self) -> [int]:
+        """Get the values of the Entities matching the Query, in the order of the tuples."""
+        return self.m_entityValues
+
+    def __len__(self) -> int:
+        """Get the amount of Entities matching the Query, refreshing it if needed."""
+        self.refresh()
+        return len(self.m_rows)
+
+    def __getitem__(self, index):
+        """Get a tuple of Components, or a list of them for a slice (eg. the range of a Job thread)."""
+        return self.m_rows[index]
+
+    def __iter__(self):
+        """Iterate over the tuples of Components."""
+        return iter(self.m_rows)
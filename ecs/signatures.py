@@ -0,0 +1,139 @@
+import numpy
+from typing import Hashable
+from ecs.entities import Entity
+
+
+class EntitySignatures:
+    """Bitmask of the Component types and tags borne by each Entity, stored in a NumPy array indexed by the index part
+    of the Entity values. Tags are only bits of the signatures: they have no data and no Component instance. A
+    signature holds up to 64 bits, one of them marking the living Entities."""
+
+    # Class members.
+    InitialCapacity: int = 1024
+    AliveBit: int = 1
+
+    # Object methods.
+    def __init__(self) -> None:
+        """Create a new EntitySignatures instance."""
+        self.m_masks: numpy.ndarray = numpy.zeros(EntitySignatures.InitialCapacity, dtype=numpy.uint64)
+        self.m_values: numpy.ndarray = numpy.full(EntitySignatures.InitialCapacity, -1, dtype=numpy.int64)
+        self.m_bits: {Hashable, int} = {}
+        self.m_version: int = 0
+
+    def bit(self, key: Hashable) -> int:
+        """Get the bit of a Component type or a tag, allocating it on first use."""
+        if key not in self.m_bits:
+            if len(self.m_bits) >= 63:
+                raise OverflowError("No more bit available in signatures for {}".format(key))
+            self.m_bits[key] = 1 << (len(self.m_bits) + 1)
+        return self.m_bits[key]
+
+    def maskOf(self, keys: [Hashable]) -> int:
+        """Get the bitmask of several Component types or tags."""
+        mask: int = 0
+        for key in keys:
+            mask |= self.bit(key)
+        return mask
+
+    @property
+    def version(self) -> int:
+        """Get the version of the signatures, changed each time a signature is modified."""
+        return self.m_version
+
+    def add(self, entityValues: [int]) -> None:
+        """Mark Entities as alive with an empty signature."""
+        indices: numpy.ndarray = self.__indices(entityValues)
+
+        if len(indices) > 0:
+            self.__reserve(int(indices.max()) + 1)
+
+        self.m_masks[indices] = numpy.uint64(EntitySignatures.AliveBit)
+        self.m_values[indices] = entityValues
+        self.m_version += 1
+
+    def remove(self, entityValues: [int]) -> None:
+        """Clear the signatures of deleted Entities."""
+        indices: numpy.ndarray = self.__livingIndices(entityValues)
+
+        if len(indices) == 0:
+            return
+
+        self.m_masks[indices] = 0
+        self.m_values[indices] = -1
+        self.m_version += 1
+
+    def set(self, entityValues: [int], mask: int) -> None:
+        """Add the bits of a mask to the signatures of Entities."""
+        indices: numpy.ndarray = self.__indices(entityValues)
+
+        if len(indices) > 0:
+            self.__reserve(int(indices.max()) + 1)
+
+        indices = self.__livingIndices(entityValues)
+
+        if len(indices) == 0:
+            return
+
+        self.m_masks[indices] |= numpy.uint64(mask)
+        self.m_version += 1
+
+    def clear(self, entityValues: [int], mask: int) -> None:
+        """Remove the bits of a mask from the signatures of Entities."""
+        indices: numpy.ndarray = self.__livingIndices(entityValues)
+
+        if len(indices) == 0:
+            return
+
+        self.m_masks[indices] &= ~numpy.uint64(mask)
+        self.m_version += 1
+
+    def has(self, entityValue: int, mask: int) -> bool:
+        """Check if the signature of an Entity contains all the bits of a mask."""
+        index: int = entityValue & Entity.IndexMask
+        return index < len(self.m_masks) and self.m_values[index] == entityValue and \
+            int(self.m_masks[index]) & mask == mask
+
+    def matches(self, entityValues: [int], required: int, excluded: int = 0) -> numpy.ndarray:
+        """Get a boolean array telling for each Entity if its signature contains all the required bits and none of
+        the excluded ones."""
+        values: numpy.ndarray = numpy.asarray(entityValues, dtype=numpy.int64)
+        indices: numpy.ndarray = values & Entity.IndexMask
+        masks: numpy.ndarray = self.m_masks[indices]
+        required |= EntitySignatures.AliveBit
+        return (self.m_values[indices] == values) & \
+            ((masks & numpy.uint64(required)) == numpy.uint64(required)) & \
+            ((masks & numpy.uint64(excluded)) == 0)
+
+    def entities(self, required: int, excluded: int = 0) -> numpy.ndarray:
+        """Get the values of all the living Entities whose signature contains all the required bits and none of the
+        excluded ones."""
+        required |= EntitySignatures.AliveBit
+        selected: numpy.ndarray = ((self.m_masks & numpy.uint64(required)) == numpy.uint64(required)) & \
+            ((self.m_masks & numpy.uint64(excluded)) == 0)
+        return self.m_values[selected]
+
+    def __indices(self, entityValues: [int]) -> numpy.ndarray:
+        """Get the indices of the signatures of Entities from their values."""
+        return numpy.asarray(entityValues, dtype=numpy.int64) & Entity.IndexMask
+
+    def __livingIndices(self, entityValues: [int]) -> numpy.ndarray:
+        """Get the indices of the signatures of Entities from their values, without the ones of the Entities that
+        are not alive (deleted, or an older generation of the index)."""
+        values: numpy.ndarray = numpy.asarray(entityValues, dtype=numpy.int64)
+        indices: numpy.ndarray = values & Entity.IndexMask
+        inRange: numpy.ndarray = indices < len(self.m_values)
+        values, indices = values[inRange], indices[inRange]
+        return indices[self.m_values[indices] == values]
+
+    def __reserve(self, capacity: int) -> None:
+        """Reallocate the arrays so that they can hold the given amount of signatures."""
+        if capacity <= len(self.m_masks):
+            return
+
+        newCapacity: int = max(capacity, 2 * len(self.m_masks))
+        masks: numpy.ndarray = numpy.zeros(newCapacity, dtype=numpy.uint64)
+        masks[:len(self.m_masks)] = self.m_masks
+        values: numpy.ndarray = numpy.full(newCapacity, -1, dtype=numpy.int64)
+        values[:len(self.m_values)] = self.m_values
+        self.m_masks = masks
+        self.m_values = values
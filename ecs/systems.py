@@ -1,6 +1,10 @@
+import asyncio
+import time
 from abc import abstractmethod
+from collections import deque
 from termcolor import colored
 from typing import Any
+from ecs.commands import CommandBuffer
 from ecs.components import Component, ComponentQuantity, ComponentFactory, Entity, Generic, Type, TypeVar, TConcreteComponent
 
 
@@ -10,6 +14,9 @@ class SystemProcessing:
     def __init__(self, components: ComponentFactory):
         """Create a new SystemProcessing instance."""
         self.m_components = components
+        self.m_query: 'Query' = None
+        self.m_lastRunTick: int = 0
+        self.m_deltaTime: float = 0.0
         self.m_dropEntities: [Entity] = []
 
     def setData(self, data: Any, setterName: str) -> None:
@@ -17,6 +24,74 @@ class SystemProcessing:
         setter: 'function' = getattr(self, setterName)
         setter(data)
 
+    def changedComponents(self) -> [Component]:
+        """Get the Components created or changed since the last run of the processing (changes made while it was
+        running included)."""
+        return self.m_components.changedSince(self.m_lastRunTick)
+
+    def hasChangedComponents(self) -> bool:
+        """Check if Components have been created or changed since the last run of the processing."""
+        return self.m_components.hasChangesSince(self.m_lastRunTick)
+
+    def addedComponents(self) -> [Component]:
+        """Get the Components created since the last run of the processing."""
+        return self.m_components.addedSince(self.m_lastRunTick)
+
+    def removedEntities(self) -> [int]:
+        """Get the values of the Entities whose Components have been deleted since the last run of the processing."""
+        return self.m_components.removedSince(self.m_lastRunTick)
+
+    @property
+    def lastRunTick(self) -> int:
+        """Get the World tick of the last run of the processing."""
+        return self.m_lastRunTick
+
+    @lastRunTick.setter
+    def lastRunTick(self, tick: int) -> None:
+        """Set the World tick of the last run of the processing."""
+        self.m_lastRunTick = tick
+
+    @property
+    def deltaTime(self) -> float:
+        """Get the simulated time (in seconds) elapsed since the previous run of the processing, when the World is
+        driven by World.advance."""
+        return self.m_deltaTime
+
+    @deltaTime.setter
+    def deltaTime(self, deltaTime: float) -> None:
+        """Set the simulated time elapsed since the previous run of the processing."""
+        self.m_deltaTime = deltaTime
+
+    def columns(self, fromIndex: int, toIndex: int) -> {str, 'numpy.ndarray'}:
+        """Get views on the columns of the processed ColumnarComponents, restricted to the given index range."""
+        return self.m_components.columns(fromIndex, toIndex)
+
+    @staticmethod
+    def RunColumns(columns: {str, 'numpy.ndarray'}, fromIndex: int, toIndex: int) -> [int]:
+        """Process an index range of the columns of the ColumnarComponents, using nothing but the columns, so that a
+        Job with the JobBackend.PROCESSES backend can run it in worker processes. Returns the slots of the
+        Components whose Entity is to be dropped. To be overridden by the processings supporting it."""
+        return []
+
+    @classmethod
+    def runsOnColumns(cls) -> bool:
+        """Check if the processing implements RunColumns."""
+        return cls.RunColumns is not SystemProcessing.RunColumns
+
+    def shouldRun(self) -> bool:
+        """Check if the processing has something to do in the current frame."""
+        return True
+
+    def dropSlots(self, slots: [int]) -> None:
+        """Drop the Entities of the Components at the given slots."""
+        components: [Component] = self.m_components.allComponents()
+        self.m_dropEntities.extend(components[slot].entity for slot in slots)
+
+    @classmethod
+    def splittable(cls) -> bool:
+        """Check if the Components of the processing can be split between several threads."""
+        return True
+
     def onDelete(self, entity: Entity) -> None:
         """Do something when an entity is removed."""
         return
@@ -32,10 +107,152 @@ class SystemProcessing:
         pass
 
     @property
-    def dropEntities(self) -> None:
+    def query(self) -> 'Query':
+        """Get the Query iterated by the processing instead of its Components, None if there is no such Query."""
+        return self.m_query
+
+    @query.setter
+    def query(self, query: 'Query') -> None:
+        """Set the Query iterated by the processing instead of its Components."""
+        self.m_query = query
+
+    @property
+    def dropEntities(self) -> [Entity]:
         """Get the entities to be dropped."""
         return self.m_dropEntities
 
+    @property
+    def commands(self) -> CommandBuffer:
+        """Get the CommandBuffer of the running thread, to request structural changes (creating an Entity, adding or
+        removing a Component, destroying an Entity) that the World applies after the Job."""
+        return CommandBuffer.Current()
+
+
+class AsyncSystemProcessing(SystemProcessing):
+    """Class for processing the components of a System with I/O, in a coroutine awaited on the event loop."""
+
+    def __init__(self, components: ComponentFactory):
+        """Create a new AsyncSystemProcessing instance."""
+        super().__init__(components)
+        self.m_loop: asyncio.AbstractEventLoop = None
+        self.m_pending: 'concurrent.futures.Future' = None
+        self.m_asyncCommands: CommandBuffer = CommandBuffer()
+
+    @classmethod
+    def splittable(cls) -> bool:
+        """A sweep processes all the Components at once."""
+        return False
+
+    def setEventLoop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Set the event loop running the coroutines, None to run them synchronously in the Jobs."""
+        self.m_loop = loop
+
+    @property
+    def busy(self) -> bool:
+        """Check if the coroutine of the last sweep is still running."""
+        return self.m_pending is not None and not self.m_pending.done()
+
+    def prepare(self, linkedSystems: {str, 'System'}, fromIndex: int, toIndex: int) -> Any:
+        """Gather, in the Job, the data from the Components needed by the coroutine."""
+        return None
+
+    @abstractmethod
+    async def runAsync(self, data: Any) -> None:
+        """Perform the I/O of a sweep, with the data given by prepare."""
+        pass
+
+    def run(self, linkedSystems: {str, 'System'}, fromIndex: int, toIndex: int) -> None:
+        """Start a new sweep if the previous one is done. Errors raised by the previous sweep are raised again, a
+        sweep cancelled by the closing of its event loop is dropped."""
+        if self.busy:
+            return
+
+        if self.m_pending is not None:
+            pending: 'concurrent.futures.Future' = self.m_pending
+            self.m_pending = None
+
+            if not pending.cancelled():
+                pending.result()
+
+        data: Any = self.prepare(linkedSystems, fromIndex, toIndex)
+
+        if self.m_loop is None:
+            asyncio.run(self.runAsync(data))
+        else:
+            self.m_pending = asyncio.run_coroutine_threadsafe(self.runAsync(data), self.m_loop)
+
+    @property
+    def commands(self) -> CommandBuffer:
+        """Get the CommandBuffer of the processing, to request structural changes from the coroutine."""
+        return self.m_asyncCommands
+
+
+class ResumableSystemProcessing(SystemProcessing):
+    """Class for processing the components of a System in a generator resumed each frame within a time budget."""
+
+    # Amount of completed sweeps whose durations (in frames) are kept.
+    SweepHistory: int = 64
+
+    def __init__(self, components: ComponentFactory):
+        """Create a new ResumableSystemProcessing instance."""
+        super().__init__(components)
+        self.m_budget: float = 0.002
+        self.m_sweep: 'Generator' = None
+        self.m_sweepFrames: int = 0
+        self.m_sweepsFrames: deque = deque(maxlen=ResumableSystemProcessing.SweepHistory)
+
+    @classmethod
+    def splittable(cls) -> bool:
+        """A sweep goes through all the Components."""
+        return False
+
+    @property
+    def budget(self) -> float:
+        """Get the time (in seconds) given to the sweep per frame."""
+        return self.m_budget
+
+    @budget.setter
+    def budget(self, budget: float) -> None:
+        """Set the time (in seconds) given to the sweep per frame. Default is 2 ms."""
+        self.m_budget = budget
+
+    @abstractmethod
+    def sweep(self, linkedSystems: {str, 'System'}) -> 'Generator':
+        """Process the Components, yielding whenever the processing can be paused."""
+        pass
+
+    def run(self, linkedSystems: {str, 'System'}, fromIndex: int, toIndex: int) -> None:
+        """Resume the current sweep, or start a new one, until the budget of the frame is spent."""
+        if self.m_sweep is None:
+            self.m_sweep = self.sweep(linkedSystems)
+            self.m_sweepFrames = 0
+
+        self.m_sweepFrames += 1
+        deadline: float = time.perf_counter() + self.m_budget
+
+        for _ in self.m_sweep:
+            if time.perf_counter() >= deadline:
+                return
+
+        self.m_sweepsFrames.append(self.m_sweepFrames)
+        self.m_sweep = None
+
+    def restart(self) -> None:
+        """Drop the current sweep: the next frame starts a new one."""
+        if self.m_sweep is not None:
+            self.m_sweep.close()
+            self.m_sweep = None
+
+    @property
+    def sweeping(self) -> bool:
+        """Check if a sweep is in progress."""
+        return self.m_sweep is not None
+
+    @property
+    def sweepsFrames(self) -> [int]:
+        """Get the amount of frames taken by each of the last completed sweeps, from the oldest one."""
+        return list(self.m_sweepsFrames)
+
 
 TConcreteSystemProcessing = TypeVar('TConcreteSystemProcessing', bound=SystemProcessing)
 
@@ -53,9 +270,90 @@ class System(Generic[TConcreteComponent]):
         self.m_name = name
         self.m_memberClass = componentClass
         self.m_linkedSystems: {str, System} = {}
-        self.m_components = ComponentFactory(componentClass)
+        self.m_components = componentClass.factoryClass()(componentClass)
         self.m_processing = processingClass(self.m_components)
-        self.m_multithreadable: bool = True
+        self.m_multithreadable: bool = processingClass.splittable()
+        self.m_signatures: 'EntitySignatures' = None
+        self.m_signatureBit: int = 0
+        self.m_tickRate: float = None
+        self.m_everyFrame: bool = False
+        self.m_nextRunTime: float = 0.0
+        self.m_lastRunTime: float = 0.0
+        self.m_reads: {Type[Component]} = {}
+        self.m_writes: {Type[Component]} = dict.fromkeys([componentClass])
+
+    @property
+    def tickRate(self) -> float:
+        """Get the rate (in Hz) at which the System runs when the World is driven by World.advance, None to run at
+        each simulation step."""
+        return self.m_tickRate
+
+    @tickRate.setter
+    def tickRate(self, rate: float) -> None:
+        """Set the rate (in Hz) at which the System runs, None to run at each simulation step."""
+        self.m_tickRate = rate
+
+    @property
+    def everyFrame(self) -> bool:
+        """Check if the System runs once per frame, after the simulation steps (eg. rendering), when the World is
+        driven by World.advance."""
+        return self.m_everyFrame
+
+    @everyFrame.setter
+    def everyFrame(self, flag: bool) -> None:
+        """Set if the System runs once per frame instead of at the simulation steps."""
+        self.m_everyFrame = flag
+
+    def isDue(self, simulationTime: float) -> bool:
+        """Check if the System has to run at the given simulation time according to its tick rate. If so, its next
+        run is planned and the elapsed simulated time is given to the processing. Late runs are not caught up."""
+        if self.m_tickRate is not None:
+            # Tolerance on the accumulation of floating point steps.
+            if simulationTime + 1e-9 < self.m_nextRunTime:
+                return False
+
+            period: float = 1. / self.m_tickRate
+            self.m_nextRunTime = max(self.m_nextRunTime + period, simulationTime + period / 2)
+
+        self.m_processing.deltaTime = simulationTime - self.m_lastRunTime
+        self.m_lastRunTime = simulationTime
+        return True
+
+    def declareReads(self, *componentClasses: Type[Component]) -> 'System':
+        """Declare Component types read by the processing, so that the World can schedule it after the Systems
+        writing them."""
+        self.m_reads.update(dict.fromkeys(componentClasses))
+        return self
+
+    def declareWrites(self, *componentClasses: Type[Component]) -> 'System':
+        """Declare Component types written by the processing (its own Component type is always written)."""
+        self.m_writes.update(dict.fromkeys(componentClasses))
+        return self
+
+    @property
+    def reads(self) -> [Type[Component]]:
+        """Get the Component types read by the processing."""
+        return list(self.m_reads)
+
+    @property
+    def writes(self) -> [Type[Component]]:
+        """Get the Component types written by the processing."""
+        return list(self.m_writes)
+
+    def conflictsWith(self, system: 'System') -> [Type[Component]]:
+        """Get the Component types that prevent the current System and the given one from running at the same
+        time: written by one of them and read or written by the other one."""
+        ownAccesses: {Type[Component]} = dict.fromkeys(self.reads + self.writes)
+        otherAccesses: {Type[Component]} = dict.fromkeys(system.reads + system.writes)
+        return [componentClass for componentClass in self.m_writes if componentClass in otherAccesses] + [
+            componentClass for componentClass in system.m_writes
+            if componentClass in ownAccesses and componentClass not in self.m_writes
+        ]
+
+    def setSignatures(self, signatures: 'EntitySignatures', bit: int) -> None:
+        """Set the signatures in which the System flags the Entities bearing its Components, with the given bit."""
+        self.m_signatures = signatures
+        self.m_signatureBit = bit
 
     def create(self, entity: Entity) -> TConcreteComponent:
         """If the Entity has no Component of the wanted type, it creates a new Component and attach it to the provided
@@ -65,17 +363,49 @@ class System(Generic[TConcreteComponent]):
         quantity: ComponentQuantity = self.m_memberClass.quantity()
 
         if quantity is ComponentQuantity.ONE:
-            listComponents: [Component] = self.m_components.components(entity)
+            existingComponent: Component = self.m_components.componentFor(entity.value)
+
+            if existingComponent is not None:
+                return existingComponent
+
+        newComponent: TConcreteComponent = self.m_components.create(entity)
+
+        if self.m_signatures is not None:
+            self.m_signatures.set([entity.value], self.m_signatureBit)
 
-            if len(listComponents) > 0:
-                return listComponents[0]
+        return newComponent
 
-        return self.m_components.create(entity)
+    def createMany(self, entities: [Entity]) -> [TConcreteComponent]:
+        """Create a Component for each of the given Entities in a single pass, as create does for one Entity."""
+        if self.m_signatures is not None:
+            self.m_signatures.set([entity.value for entity in entities], self.m_signatureBit)
+
+        if self.m_memberClass.quantity() is not ComponentQuantity.ONE:
+            return self.m_components.createMany(entities)
+
+        missingEntities: [Entity] = [entity for entity in entities if not self.m_components.has(entity.value)]
+        self.m_components.createMany(missingEntities)
+        return [self.m_components.componentFor(entity.value) for entity in entities]
 
     def delete(self, entity: Entity) -> None:
         """Delete the component(s) attached to an Entity."""
-        self.m_processing.onDelete(entity)
-        self.m_components.delete(entity)
+        self.deleteMany([entity])
+
+    def deleteMany(self, entities: [Entity]) -> None:
+        """Delete the component(s) attached to any of the given Entities in a single pass."""
+        deletedEntities: [Entity] = [entity for entity in entities if self.m_components.has(entity.value)]
+
+        for entity in deletedEntities:
+            self.m_processing.onDelete(entity)
+
+        self.m_components.deleteMany(deletedEntities)
+
+        if self.m_signatures is not None and len(deletedEntities) > 0:
+            self.m_signatures.clear([entity.value for entity in deletedEntities], self.m_signatureBit)
+
+    def enablePool(self, capacity: int = 1024) -> None:
+        """Reuse up to capacity deleted Components for the next creations (see ComponentFactory.enablePool)."""
+        self.m_components.enablePool(capacity)
 
     def link(self, linkedSystem) -> None:
         """Link another System to the current one."""
@@ -89,32 +419,47 @@ class System(Generic[TConcreteComponent]):
         if name in self.m_linkedSystems:
             self.m_linkedSystems.pop(name)
 
+    def bindQuery(self, query: 'Query') -> None:
+        """Make the processing iterate over the tuples of a Query: the index ranges given to the processing (eg. by
+        the Jobs) are then ranges of the Query. The Component types of the Query are declared as read."""
+        self.m_processing.query = query
+        self.declareReads(*query.componentClasses)
+
     @property
     def amountComponents(self) -> int:
-        """Get the amount of Components managed by the current System."""
+        """Get the amount of Components (or Query tuples if a Query is bound) managed by the current System."""
+        if self.m_processing.query is not None:
+            return len(self.m_processing.query)
         return self.m_components.countComponents()
 
+    def alignIndex(self, index: int) -> int:
+        """Get the first index, from the given one, at which the Components (or Query tuples) can be split between
+        threads without splitting the Components of an Entity."""
+        if self.m_processing.query is not None:
+            return index
+        return self.m_components.alignIndex(index)
+
+    @property
+    def factory(self) -> ComponentFactory:
+        """Get the ComponentFactory storing the Components of the current System."""
+        return self.m_components
+
+    @property
+    def componentClass(self) -> Type[TConcreteComponent]:
+        """Get the type of the Components managed by the current System."""
+        return self.m_memberClass
+
     def components(self) -> [Component]:
         """Get all the Components managed by the current System."""
         return self.m_components.allComponents()
 
-    def componentFor(self, entity: Entity) -> Component:
-        """Get the first Component found for the given entity."""
-        try:
-            return next(c for c in self.components() if c.entityValue == entity)
-        except:
-            return None
-
-    def allComponentsFor(self, entity: Entity) -> [Component]:
-        """Get the Components found for the given entity."""
-        foundComponents: [Component] = []
-        listComponents: [Component] = self.m_components.allComponents()
-
-        for component in listComponents:
-            if component.entityValue == entity:
-                foundComponents.append(component)
+    def componentFor(self, entity: int) -> Component:
+        """Get the first Component found for the given entity value, None if there is none."""
+        return self.m_components.componentFor(entity)
 
-        return foundComponents
+    def allComponentsFor(self, entity: int) -> [Component]:
+        """Get the Components found for the given entity value."""
+        return self.m_components.componentsFor(entity)
 
     def process(self, fromIndex: int, toIndex: int) -> [Entity]:
         """Run the Components processing. Returns a list of Entity to be removed by the World."""
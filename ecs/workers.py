@@ -0,0 +1,159 @@
+import os
+import queue
+import threading
+import time
+
+
+class WorkerBatch:
+    """A set of tasks submitted together to the WorkerPool, whose completion can be waited for."""
+
+    __slots__ = ('m_remaining', 'm_done', 'm_lock', 'm_error')
+
+    def __init__(self, amountTasks: int) -> None:
+        """Create a new WorkerBatch instance."""
+        self.m_remaining: int = amountTasks
+        self.m_done: threading.Event = threading.Event()
+        self.m_lock: threading.Lock = threading.Lock()
+        self.m_error: BaseException = None
+
+        if amountTasks == 0:
+            self.m_done.set()
+
+    def taskDone(self, error: BaseException = None) -> None:
+        """Count a task of the batch as done, keeping the first error raised by a task."""
+        with self.m_lock:
+            if error is not None and self.m_error is None:
+                self.m_error = error
+
+            self.m_remaining -= 1
+
+            if self.m_remaining == 0:
+                self.m_done.set()
+
+    def wait(self) -> None:
+        """Wait for all the tasks of the batch to be done and raise again the first error raised by a task."""
+        self.m_done.wait()
+
+        if self.m_error is not None:
+            raise self.m_error
+
+
+class WorkerPool:
+    """Persistent threads shared by all the Jobs of a World. Tasks are explicitly submitted in batches to a queue, so
+    that a worker that was busy when a batch was submitted still finds its tasks in the queue afterwards."""
+
+    def __init__(self, workerCount: int = None) -> None:
+        """Create a new WorkerPool instance, with as many workers as cores by default."""
+        self.m_workerCount: int = max(1, workerCount or os.cpu_count() or 1)
+        self.m_tasks: queue.SimpleQueue = queue.SimpleQueue()
+        self.m_workers: [threading.Thread] = []
+        self.m_statsLock: threading.Lock = threading.Lock()
+        self.m_dispatchCount: int = 0
+        self.m_dispatchTotal: float = 0.0
+        self.m_dispatchMax: float = 0.0
+        self.m_startLock: threading.Lock = threading.Lock()
+        self.m_running: bool = True
+
+    def submit(self, tasks: ['function']) -> WorkerBatch:
+        """Submit functions (without parameters) to be run by the workers, started on the first submission. The
+        returned batch can be waited for."""
+        if not self.m_running:
+            raise RuntimeError("The WorkerPool has been stopped")
+
+        if len(self.m_workers) == 0:
+            self.__startWorkers()
+
+        batch: WorkerBatch = WorkerBatch(len(tasks))
+        submitTime: float = time.perf_counter()
+
+        for task in tasks:
+            self.m_tasks.put((task, batch, submitTime))
+
+        return batch
+
+    def runAll(self, tasks: ['function']) -> None:
+        """Run functions (without parameters) on the workers and wait for all of them to be done."""
+        self.submit(tasks).wait()
+
+    def stop(self) -> None:
+        """Stop the workers once the tasks already submitted are done."""
+        if not self.m_running:
+            return
+
+        with self.m_startLock:
+            self.m_running = False
+
+        for _ in self.m_workers:
+            self.m_tasks.put(None)
+
+        for worker in self.m_workers:
+            if worker is not threading.current_thread():
+                worker.join()
+
+    def resetStats(self) -> None:
+        """Forget the dispatch latencies measured so far."""
+        with self.m_statsLock:
+            self.m_dispatchCount = 0
+            self.m_dispatchTotal = 0.0
+            self.m_dispatchMax = 0.0
+
+    @property
+    def workerCount(self) -> int:
+        """Get the amount of workers of the WorkerPool."""
+        return self.m_workerCount
+
+    @property
+    def running(self) -> bool:
+        """Check if the WorkerPool accepts new tasks."""
+        return self.m_running
+
+    @property
+    def dispatchStats(self) -> {str, float}:
+        """Get the amount of dispatched tasks and the average and maximal delay (in seconds) between the submission
+        of a task and its start by a worker."""
+        with self.m_statsLock:
+            return {
+                'count': self.m_dispatchCount,
+                'mean': self.m_dispatchTotal / self.m_dispatchCount if self.m_dispatchCount > 0 else 0.0,
+                'max': self.m_dispatchMax
+            }
+
+    def __startWorkers(self) -> None:
+        """Start the threads of the workers."""
+        with self.m_startLock:
+            if len(self.m_workers) > 0 or not self.m_running:
+                return
+
+            for index in range(self.m_workerCount):
+                worker: threading.Thread = threading.Thread(
+                    target=self.__work,
+                    name="ecs-worker-{}".format(index),
+                    daemon=True
+                )
+                self.m_workers.append(worker)
+                worker.start()
+
+    def __work(self) -> None:
+        """Loop of a worker: run the tasks of the queue until a stop sentinel is met."""
+        while True:
+            item: tuple = self.m_tasks.get()
+
+            if item is None:
+                return
+
+            task, batch, submitTime = item
+            self.__recordDispatch(time.perf_counter() - submitTime)
+
+            try:
+                task()
+            except BaseException as error:
+                batch.taskDone(error)
+            else:
+                batch.taskDone()
+
+    def __recordDispatch(self, latency: float) -> None:
+        """Add the delay before the start of a task to the dispatch statistics."""
+        with self.m_statsLock:
+            self.m_dispatchCount += 1
+            self.m_dispatchTotal += latency
+            self.m_dispatchMax = max(self.m_dispatchMax, latency)
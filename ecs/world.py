@@ -1,18 +1,42 @@
+import asyncio
+import time
+from termcolor import colored
+from ecs.commands import CommandBuffer, CommandType, PendingEntity
 from ecs.entities import Entity, EntityFactory
-from ecs.systems import System, Type, TConcreteComponent, TConcreteSystemProcessing
-from ecs.jobs import Job
+from ecs.instrumentation import FrameRecorder
+from ecs.systems import AsyncSystemProcessing, System, ComponentFactory, Type, TConcreteComponent, TConcreteSystemProcessing
+from ecs.jobs import Job, JobBackend
+from ecs.processes import ProcessPool
+from ecs.queries import Query
+from ecs.signatures import EntitySignatures
+from ecs.workers import WorkerPool
 
 
 class World:
     """Entry class for using the ecs instances. Handles interactions between these instances as automatic data
     suppression. For example, it removes all the components attached to an entity when this one is deleted."""
 
-    def __init__(self):
-        """Create a new World instance."""
+    # Maximal amount of simulation steps run by a call to advance: the time of the extra steps is dropped, so that a
+    # frame under load slows the simulation down instead of taking even more time to catch up.
+    MaxSubsteps: int = 4
+
+    def __init__(self, workerCount: int = None):
+        """Create a new World instance. Its Jobs share a pool of workerCount threads (as many as cores by
+        default)."""
         self.m_entities: EntityFactory = EntityFactory()
-        self.m_entityList: [Entity] = []
+        self.m_entityMap: {int, Entity} = {}
         self.m_systems: {str, System} = {}
+        self.m_queries: {tuple, Query} = {}
+        self.m_signatures: EntitySignatures = EntitySignatures()
         self.m_jobs: {str, Job} = {}
+        self.m_workers: WorkerPool = WorkerPool(workerCount)
+        self.m_processes: ProcessPool = None
+        self.m_recorder: FrameRecorder = FrameRecorder()
+        self.m_tick: int = 0
+        self.m_timestep: float = 1. / 60.
+        self.m_accumulator: float = 0.0
+        self.m_simulationTime: float = 0.0
+        self.m_droppedSteps: int = 0
 
     def __del__(self):
         """Clear data on World destruction."""
@@ -20,15 +44,65 @@ class World:
 
     def clear(self):
         """Clear all data of the current World."""
-        while len(self.m_entityList) > 0:
-            self.delete(self.m_entityList[0])
+        self.deleteMany(list(self.m_entityMap.values()))
 
     def createEntity(self) -> Entity:
         """Create an Entity instance."""
         newEntity: Entity = self.m_entities.create()
-        self.m_entityList.append(newEntity)
+        self.m_entityMap[newEntity.value] = newEntity
+        self.m_signatures.add([newEntity.value])
         return newEntity
 
+    def spawnBatch(self, count: int, componentInitializers: {str, 'function'} = None) -> [Entity]:
+        """Create several Entity instances at once, with a Component of each of the given Systems. An initializer,
+        called with the new Component and the index of its Entity in the batch, can be given per System name (None
+        for no initialization)."""
+        newEntities: [Entity] = self.m_entities.createMany(count)
+
+        for entity in newEntities:
+            self.m_entityMap[entity.value] = entity
+
+        self.m_signatures.add([entity.value for entity in newEntities])
+
+        for systemName, initializer in (componentInitializers or {}).items():
+            newComponents: [TConcreteComponent] = self.m_systems[systemName].createMany(newEntities)
+
+            if initializer is not None:
+                for index, component in enumerate(newComponents):
+                    initializer(component, index)
+
+        return newEntities
+
+    def isAlive(self, entityValue: int) -> bool:
+        """Check if the Entity of the given value exists in the World. A value kept after its Entity was deleted is
+        never alive again, even when the index of the Entity has been reused."""
+        return self.m_entities.hasValue(entityValue)
+
+    def addTag(self, entity: Entity, tag: str) -> None:
+        """Add a tag (eg. 'disabled', 'dead', 'offscreen') to an Entity. A tag is only a bit of the signature of the
+        Entity, it bears no data. To be called out of the Jobs, Systems use their CommandBuffer instead."""
+        if self.m_entities.has(entity):
+            self.m_signatures.set([entity.value], self.m_signatures.bit(tag))
+
+    def removeTag(self, entity: Entity, tag: str) -> None:
+        """Remove a tag from an Entity. To be called out of the Jobs, Systems use their CommandBuffer instead."""
+        if self.m_entities.has(entity):
+            self.m_signatures.clear([entity.value], self.m_signatures.bit(tag))
+
+    def hasTag(self, entityValue: int, tag: str) -> bool:
+        """Check if the Entity of the given value bears a tag."""
+        return self.m_signatures.has(entityValue, self.m_signatures.bit(tag))
+
+    def entitiesWith(self, *keys, exclude: tuple = ()) -> 'numpy.ndarray':
+        """Get the values of the Entities bearing all the given Component types and tags, and none of the excluded
+        ones."""
+        return self.m_signatures.entities(self.m_signatures.maskOf(keys), self.m_signatures.maskOf(exclude))
+
+    @property
+    def signatures(self) -> EntitySignatures:
+        """Get the signatures (Component types and tags bitmasks) of the Entities."""
+        return self.m_signatures
+
     def system(
         self,
         name: str,
@@ -38,40 +112,366 @@ class World:
         """Get a System by its name."""
         if name not in self.m_systems:
             if componentClass is not None and processingClass is not None:
-                self.m_systems[name] = System(name, componentClass, processingClass)
+                newSystem: System = System(name, componentClass, processingClass)
+                newSystem.setSignatures(self.m_signatures, self.m_signatures.bit(componentClass))
+                self.m_systems[name] = newSystem
         return self.m_systems[name]
 
-    def addJob(self, jobName: str, systemNames: [str], threadCount: int = 4) -> None:
-        """Get a Job used to run systems concurrently."""
+    def query(self, *componentClasses: Type[TConcreteComponent], include: tuple = (), exclude: tuple = ()) -> Query:
+        """Get the cached Query of the Entities bearing the given Component types and tags, but no excluded one."""
+        signature: tuple = (tuple(componentClasses), tuple(include), tuple(exclude))
+
+        if signature not in self.m_queries:
+            factories: [ComponentFactory] = [
+                self.__systemFor(componentClass).factory for componentClass in componentClasses
+            ]
+            self.m_queries[signature] = Query(
+                factories,
+                self.m_signatures,
+                self.m_signatures.maskOf(componentClasses + tuple(include)),
+                self.m_signatures.maskOf(exclude)
+            )
+
+        query: Query = self.m_queries[signature]
+        query.refresh()
+        return query
+
+    def __systemFor(self, componentClass: Type[TConcreteComponent]) -> System:
+        """Get the System managing the given Component type."""
+        for system in self.m_systems.values():
+            if system.componentClass is componentClass:
+                return system
+
+        raise KeyError("No System for {}".format(componentClass.__name__))
+
+    def addJob(
+        self,
+        jobName: str,
+        systemNames: [str],
+        threadCount: int = 4,
+        backend: JobBackend = JobBackend.THREADS
+    ) -> None:
+        """Get a Job used to run systems concurrently. The Components of its Systems are split in threadCount
+        tasks, run by the workers shared by all the Jobs (or by worker processes with JobBackend.PROCESSES)."""
         if jobName not in self.m_jobs:
             systems: [System] = [sys for sys in self.m_systems.values() if sys.name in systemNames]
-            self.m_jobs[jobName] = Job(jobName, systems, max(1, threadCount))
+            processes: ProcessPool = self.processes if backend is JobBackend.PROCESSES else None
+            self.m_jobs[jobName] = Job(
+                jobName,
+                systems,
+                max(1, threadCount),
+                self.m_workers,
+                processes,
+                self.m_recorder
+            )
+
+    def schedule(self, systemNames: [str] = None) -> [[System]]:
+        """Get the layers of Systems (all of them by default) that can run at the same time, according to the
+        Component types they read and write. A System is put in the layer following the last layer containing a
+        System registered before it and conflicting with it, so that conflicting Systems always run in registration
+        order."""
+        systems: [System] = [
+            system for system in self.m_systems.values() if systemNames is None or system.name in systemNames
+        ]
+        layerOf: {System, int} = {}
+        layers: [[System]] = []
+
+        for index, system in enumerate(systems):
+            layer: int = max(
+                (layerOf[previous] + 1 for previous in systems[:index] if len(system.conflictsWith(previous)) > 0),
+                default=0
+            )
+            layerOf[system] = layer
+
+            if layer == len(layers):
+                layers.append([])
+
+            layers[layer].append(system)
+
+        return layers
+
+    def autoSchedule(
+        self,
+        threadCount: int = 4,
+        systemNames: [str] = None,
+        backend: JobBackend = JobBackend.THREADS
+    ) -> None:
+        """Replace the Jobs by one Job per layer of the schedule of the Systems (see schedule)."""
+        self.stopJobs()
+        self.m_jobs = {}
+
+        for index, layer in enumerate(self.schedule(systemNames)):
+            self.addJob("layer-{}".format(index), [system.name for system in layer], threadCount, backend)
+
+    def debugSchedule(self) -> None:
+        """Show the Jobs in their execution order, with the Component types read and written by their Systems and
+        the Systems of the previous Jobs they depend on."""
+        previousSystems: [System] = []
+
+        for jobName, job in self.m_jobs.items():
+            print(colored("[Debug] Job {}".format(jobName), 'cyan'))
+
+            for system in job.systems:
+                dependencies: [str] = [
+                    "{} ({})".format(previous.name, ", ".join(cls.__name__ for cls in system.conflictsWith(previous)))
+                    for previous in previousSystems if len(system.conflictsWith(previous)) > 0
+                ]
+                print("    {}: reads [{}], writes [{}], after [{}]".format(
+                    system.name,
+                    ", ".join(cls.__name__ for cls in system.reads),
+                    ", ".join(cls.__name__ for cls in system.writes),
+                    ", ".join(dependencies)
+                ))
+
+            previousSystems.extend(job.systems)
 
     def delete(self, entity: Entity) -> None:
         """Delete an Entity and all its attached Components."""
+        self.deleteMany([entity])
+
+    def deleteMany(self, entities: [Entity]) -> None:
+        """Delete several Entity instances and all their attached Components, with a single pass per System."""
+        aliveEntities: {int, Entity} = {}
+
+        for entity in entities:
+            if entity is not None and self.m_entities.has(entity):
+                aliveEntities[entity.value] = entity
+
+        if len(aliveEntities) == 0:
+            return
+
+        deletedEntities: [Entity] = list(aliveEntities.values())
+
         for name in self.m_systems:
-            if self.m_entities.has(entity):
-                self.m_systems[name].delete(entity)
-        self.m_entities.delete(entity)
+            self.m_systems[name].deleteMany(deletedEntities)
+
+        self.m_signatures.remove([entity.value for entity in deletedEntities])
 
-        try:
-            self.m_entityList.remove(entity)
-        except:
-            pass
+        for entity in deletedEntities:
+            self.m_entityMap.pop(entity.value, None)
+            self.m_entities.delete(entity)
 
     def run(self):
-        """Run all the registered Systems in the World."""
+        """Run all the registered Systems in the World. Each Job runs at its own tick, at which the changes of the
+        Components are recorded."""
+        startTime: float = time.perf_counter()
+        self.__setEventLoop(None)
+        self.__runJobs()
+        self.__applyAsyncCommands()
+        self.__recordFrame(startTime)
+
+    async def runAsync(self) -> None:
+        """Run all the registered Systems in the World, as run does, with the Jobs in an executor thread."""
+        startTime: float = time.perf_counter()
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.__setEventLoop(loop)
+        await loop.run_in_executor(None, self.__runJobs)
+        self.__applyAsyncCommands()
+        self.__recordFrame(startTime)
+
+    def advance(self, elapsedTime: float) -> int:
+        """Run the fixed steps fitting in the elapsed time (in seconds), then a frame. Returns the amount of steps."""
+        startTime: float = time.perf_counter()
+        self.__setEventLoop(None)
+        amountSteps: int = self.__advanceSteps(elapsedTime)
+        self.__applyAsyncCommands()
+        self.__recordFrame(startTime)
+        return amountSteps
+
+    async def advanceAsync(self, elapsedTime: float) -> int:
+        """Drive the World with a fixed timestep, as advance does, from an asyncio event loop (see runAsync)."""
+        startTime: float = time.perf_counter()
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.__setEventLoop(loop)
+        amountSteps: int = await loop.run_in_executor(None, self.__advanceSteps, elapsedTime)
+        self.__applyAsyncCommands()
+        self.__recordFrame(startTime)
+        return amountSteps
+
+    @property
+    def timestep(self) -> float:
+        """Get the simulated time (in seconds) of a simulation step."""
+        return self.m_timestep
+
+    @timestep.setter
+    def timestep(self, timestep: float) -> None:
+        """Set the simulated time (in seconds) of a simulation step. Default is 1/60."""
+        self.m_timestep = timestep
+
+    @property
+    def simulationTime(self) -> float:
+        """Get the simulated time (in seconds) since the World was first advanced."""
+        return self.m_simulationTime
+
+    @property
+    def droppedSteps(self) -> int:
+        """Get the amount of simulation steps dropped because frames took too long."""
+        return self.m_droppedSteps
+
+    def __advanceSteps(self, elapsedTime: float) -> int:
+        """Run the simulation steps fitting in the elapsed time, then the Systems running every frame."""
+        self.m_accumulator += elapsedTime
+        amountSteps: int = int(self.m_accumulator // self.m_timestep)
+
+        if amountSteps > World.MaxSubsteps:
+            self.m_droppedSteps += amountSteps - World.MaxSubsteps
+            self.m_accumulator -= (amountSteps - World.MaxSubsteps) * self.m_timestep
+            amountSteps = World.MaxSubsteps
+
+        for _ in range(amountSteps):
+            self.m_accumulator -= self.m_timestep
+            self.m_simulationTime += self.m_timestep
+            dueSystems: {System} = {
+                system for system in self.m_systems.values()
+                if not system.everyFrame and system.isDue(self.m_simulationTime)
+            }
+            self.__runJobs(dueSystems)
+
+        frameSystems: {System} = {system for system in self.m_systems.values() if system.everyFrame}
+
+        for system in frameSystems:
+            system.processing.deltaTime = elapsedTime
+
+        self.__runJobs(frameSystems)
+        return amountSteps
+
+    @property
+    def recorder(self) -> FrameRecorder:
+        """Get the recorder of the timings of the frames, Jobs and Systems, disabled by default."""
+        return self.m_recorder
+
+    def __recordFrame(self, startTime: float) -> None:
+        """Record the timing of a frame, if the recorder is enabled."""
+        if self.m_recorder.enabled:
+            self.m_recorder.record('frame', 'world', startTime, time.perf_counter())
+
+    def __setEventLoop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Set the event loop running the coroutines of the AsyncSystemProcessings."""
+        for system in self.m_systems.values():
+            if isinstance(system.processing, AsyncSystemProcessing):
+                system.processing.setEventLoop(loop)
+
+    def __applyAsyncCommands(self) -> None:
+        """Apply the structural changes requested by the coroutines of the AsyncSystemProcessings."""
+        buffers: [CommandBuffer] = [
+            system.processing.commands for system in self.m_systems.values()
+            if isinstance(system.processing, AsyncSystemProcessing)
+        ]
+
+        if any(len(buffer) > 0 for buffer in buffers):
+            self.applyCommands(buffers)
+
+    def __runJobs(self, systems: {System} = None) -> None:
+        """Run the Jobs in order, restricted to the given Systems if any."""
         for jobName in self.m_jobs:
             job: Job = self.m_jobs[jobName]
-            job.execute()
+            jobSystems: [System] = job.systems if systems is None else [
+                system for system in job.systems if system in systems
+            ]
+
+            if len(jobSystems) == 0:
+                continue
+
+            self.__advanceTick()
+            job.execute(jobSystems)
+            self.applyCommands(job.commandBuffers)
 
             # Clear the entities before running the next job.
-            clearEntitiesList: [Entity] = job.dropEntity
-            for entity in clearEntitiesList:
-                self.delete(entity)
+            self.deleteMany(job.dropEntity)
+
+            for system in jobSystems:
+                system.processing.lastRunTick = self.m_tick
+
+        self.__pruneChanges()
+
+    @property
+    def workers(self) -> WorkerPool:
+        """Get the pool of threads shared by the Jobs."""
+        return self.m_workers
+
+    @property
+    def processes(self) -> ProcessPool:
+        """Get the worker processes shared by the Jobs using the JobBackend.PROCESSES backend, started on first
+        use."""
+        if self.m_processes is None:
+            self.m_processes = ProcessPool()
+        return self.m_processes
+
+    @property
+    def tick(self) -> int:
+        """Get the current tick of the World."""
+        return self.m_tick
+
+    def __advanceTick(self) -> None:
+        """Move to the next tick and make the ComponentFactories record their changes at this tick. The
+        ComponentFactories are compacted, as their Components may be accessed by several threads during the Job."""
+        self.m_tick += 1
+
+        for system in self.m_systems.values():
+            system.factory.tick = self.m_tick
+            system.factory.compact()
+
+    def __pruneChanges(self) -> None:
+        """Forget the changes of the Components that every running System has already seen."""
+        runningSystems: [System] = [system for job in self.m_jobs.values() for system in job.systems]
+
+        if len(runningSystems) == 0:
+            return
+
+        oldestTick: int = min(system.processing.lastRunTick for system in runningSystems)
+
+        for system in self.m_systems.values():
+            system.factory.pruneChanges(oldestTick)
+
+    def applyCommands(self, buffers: [CommandBuffer]) -> None:
+        """Apply the structural changes recorded in CommandBuffers, in a single pass sorted by command type, then by
+        buffer and recording order: Entities are created, then Components and tags added, then removed, then Entities
+        destroyed."""
+        destroyedEntities: [Entity] = []
+
+        for command in CommandBuffer.Sorted(buffers):
+            commandType: CommandType = command[0]
+            entity: Entity = command[3]
+
+            if commandType is CommandType.CREATE_ENTITY:
+                entity.m_entity = self.createEntity()
+                continue
+
+            if isinstance(entity, PendingEntity):
+                entity = entity.entity
+
+            if commandType is CommandType.ADD_COMPONENT:
+                if self.m_entities.has(entity):
+                    newComponent: TConcreteComponent = self.m_systems[command[4]].create(entity)
+                    initializer: 'function' = command[5]
+
+                    if initializer is not None:
+                        initializer(newComponent)
+            elif commandType is CommandType.REMOVE_COMPONENT:
+                if self.m_entities.has(entity):
+                    self.m_systems[command[4]].delete(entity)
+            elif commandType is CommandType.ADD_TAG:
+                self.addTag(entity, command[4])
+            elif commandType is CommandType.REMOVE_TAG:
+                self.removeTag(entity, command[4])
+            else:
+                destroyedEntities.append(entity)
+
+        self.deleteMany(destroyedEntities)
+
+        for buffer in buffers:
+            buffer.clear()
 
     def stop(self) -> None:
-        """Stop all the Jobs."""
+        """Stop all the Jobs and the workers."""
+        self.stopJobs()
+        self.m_workers.stop()
+
+        if self.m_processes is not None:
+            self.m_processes.stop()
+
+    def stopJobs(self) -> None:
+        """Stop all the Jobs, keeping the workers running."""
         for jobName in self.m_jobs:
             job: Job = self.m_jobs[jobName]
             job.stop()
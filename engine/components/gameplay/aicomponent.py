@@ -1,20 +1,32 @@
+import itertools
+import numpy
 import random
+import threading
+from enum import Enum
+from ecs.columns import ColumnarComponentFactory
 from ecs.components import Component, ComponentFactory
 from ecs.entities import Entity
 from ecs.systems import SystemProcessing, System
-from game.appdata import SystemName
+from ecs.queries import Query
 from engine.geometry import Point
-from ..spritecomponent import SpriteComponent
+from engine.spatial import SpatialHash
+from ..spritecomponent import Sprite
 from .charastatscomponent import CharacterPropertiesComponent
 
 class AIComponent(Component):
     """Component for making Characters act by themselves."""
 
+    __slots__ = ('m_target',)
+
     def __init__(self, entity: Entity):
         """Create a new AIComponent instance."""
         super().__init__(entity)
         self.m_target: Entity = None
 
+    def reset(self) -> None:
+        """Forget the target before the Component is reused."""
+        self.m_target = None
+
     @property
     def target(self) -> Entity:
         """Get the target of the current intelligence."""
@@ -26,78 +38,216 @@ class AIComponent(Component):
         self.m_target = other
 
 
+class TargetSelection(Enum):
+    """How the AI chooses a new target."""
+    RANDOM = 0   # Any other character matching the Query of the AI.
+    NEAREST = 1  # The closest living one, found in the spatial index.
+
+
 class AIProcessing(SystemProcessing):
     """System processing of AIComponents."""
 
+    # Amount of closest Sprites first asked to the spatial index by the NEAREST selection (doubled until a living
+    # candidate is found).
+    NearestBatch: int = 4
+
     def __init__(self, components: ComponentFactory):
         """Create a new AIProcessing instance."""
         super().__init__(components)
+        self.m_targetSelection: TargetSelection = TargetSelection.RANDOM
+        self.m_spatialIndex: SpatialHash = None
+        # Shared by the threads of the Job: guards the cached rows below and the life column.
+        self.m_lock: threading.Lock = threading.Lock()
+        # Rows of the Query when last processed, with their entity values, the slots of their
+        # CharacterPropertiesComponents in the columns of m_factory and the row of each entity index (-1 when it
+        # does not match the Query).
+        self.m_rows: [tuple] = None
+        self.m_rowValues: numpy.ndarray = None
+        self.m_slots: numpy.ndarray = None
+        self.m_factory: ColumnarComponentFactory = None
+        self.m_entityRows: numpy.ndarray = None
 
-    def selectTarget(self, linkedSystems: {str, System}, fromIndex: int, toIndex: int) -> None:
-        """Give each character a target to attack."""
-        aiComponentsList: [AIComponent] = self.m_components.allComponents()
-        charPropsSystem: System = linkedSystems[SystemName.characterProperties()]
-        botEntitiesList: [Entity] = []
+    @property
+    def targetSelection(self) -> TargetSelection:
+        """Get how the AI chooses a new target."""
+        return self.m_targetSelection
+
+    @targetSelection.setter
+    def targetSelection(self, selection: TargetSelection) -> None:
+        """Set how the AI chooses a new target. NEAREST needs a spatial index, otherwise RANDOM is used."""
+        self.m_targetSelection = selection
+
+    def setSpatialIndex(self, index: SpatialHash) -> None:
+        """Set the spatial index of the Sprites (by entity value), used by the NEAREST selection."""
+        self.m_spatialIndex = index
+
+    def randomTarget(self, entityValue: int) -> int:
+        """Get a random entity matching the bound Query other than the given one, None if there is none."""
+        query: Query = self.m_query
+        candidates: [int] = query.entities()
+
+        if len(candidates) - (0 if query.rowFor(entityValue) is None else 1) <= 0:
+            return None
+
+        while True:
+            other: int = random.choice(candidates)
+
+            if other != entityValue:
+                return other
+
+    def nearestTarget(self, entityValue: int, position: Point) -> int:
+        """Get the living candidate closest to the position other than the given entity, None if there is none."""
+        query: Query = self.m_query
+        index: SpatialHash = self.m_spatialIndex
+        amountNearest: int = AIProcessing.NearestBatch
+
+        while True:
+            nearest: [int] = index.nearest(position, amountNearest, entityValue)
 
-        # List all the entities bearing an AI component and a Character Properties component.
-        for component in aiComponentsList:
-            entity: Entity = component.entityValue
-            charPropsSystem: [System] = linkedSystems[SystemName.characterProperties()]
+            for other in nearest:
+                row: tuple = query.rowFor(other)
 
-            if charPropsSystem.componentFor(entity) is not None:
-                botEntitiesList.append(component.entityValue)
+                if row is not None and row[2].life > 0:
+                    return other
+
+            if len(nearest) < amountNearest:
+                return None
+
+            amountNearest *= 2
+
+    def selectTarget(self, linkedSystems: {str, System}, fromIndex: int, toIndex: int) -> None:
+        """Give each character a target to attack."""
+        query: Query = self.m_query
+        nearestSelection: bool = self.m_targetSelection is TargetSelection.NEAREST and self.m_spatialIndex is not None
 
-        # Entities with a CharacterPropertiesComponent, it should be good to fight against them!
         for index in range(fromIndex, toIndex):
-            ai: Component = aiComponentsList[index]
+            ai: AIComponent = query[index][0]
             changeTarget: bool = False
 
             if ai.target is None:
                 changeTarget = True
             else:
-                targetProps: CharacterPropertiesComponent = charPropsSystem.componentFor(ai.target)
+                targetRow: tuple = query.rowFor(ai.target)
 
-                if targetProps is None or targetProps.life == 0:
+                if targetRow is None or targetRow[2].life == 0:
                     changeTarget = True
 
             if changeTarget:
-                selectedEntity: Entity = random.choice(botEntitiesList)
-                ai.target = selectedEntity if selectedEntity is not entity else None
+                if nearestSelection:
+                    ai.target = self.nearestTarget(ai.entityValue, Point(*query[index][1].sprite.rect.center))
+                else:
+                    ai.target = self.randomTarget(ai.entityValue)
 
     def processAI(self, linkedSystems: {str, System}, fromIndex: int, toIndex: int) -> None:
-        """Process the AI itself."""
-        aiComponentsList: [AIComponent] = self.m_components.allComponents()
-        spriteSystem: System = linkedSystems[SystemName.sprite()]
-        charPropsSystem: System = linkedSystems[SystemName.characterProperties()]
-
-        for index in range(fromIndex, toIndex):
-            component: Component = aiComponentsList[index]
-            entity: Entity = component.entityValue
-            sprite: SpriteComponent = spriteSystem.componentFor(entity).sprite
-            charProps: CharacterPropertiesComponent = charPropsSystem.componentFor(entity)
-
-            targetEntity: Entity = component.target
-
-            if targetEntity is None:
-                continue
-
-            targetSprite: SpriteComponent = spriteSystem.componentFor(targetEntity).sprite
-            targetCharProps: CharacterPropertiesComponent = charPropsSystem.componentFor(targetEntity)
-
-            if not sprite.collides(targetSprite):
-                # Move towards the target.
-                shiftPosition: Point = Point()
-                shiftPosition.x = charProps.speed if sprite.position.x < targetSprite.position.x else -charProps.speed
-                shiftPosition.y = charProps.speed if sprite.position.y < targetSprite.position.y else -charProps.speed
-                sprite.position = sprite.position + shiftPosition
+        """Process the AI itself, for all the characters of the range at once: those not colliding with their target
+        move towards it by their speed on both axes, the others attack it. Positions, speeds and attacks are gathered
+        in NumPy arrays, the moves are written back to the Sprites in bulk and the damages are applied to the life
+        column of the targets."""
+        self.__refreshRows()
+        rows: [tuple] = self.m_rows[fromIndex:toIndex]
+
+        if len(rows) == 0:
+            return
+
+        # Rows of the targets in the Query, -1 for no target or a target not matching the Query.
+        targets: numpy.ndarray = numpy.fromiter(
+            (-1 if row[0].target is None else row[0].target for row in rows),
+            dtype=numpy.int64,
+            count=len(rows)
+        )
+        targetIndices: numpy.ndarray = targets & Entity.IndexMask
+        known: numpy.ndarray = numpy.nonzero((targets >= 0) & (targetIndices < len(self.m_entityRows)))[0]
+        knownRows: numpy.ndarray = self.m_entityRows[targetIndices[known]]
+        # A row of the same index may hold another generation of the Entity.
+        knownRows[(knownRows >= 0) & (self.m_rowValues[knownRows] != targets[known])] = -1
+        targetRows: numpy.ndarray = numpy.full(len(rows), -1, dtype=numpy.int64)
+        targetRows[known] = knownRows
+        chasing: numpy.ndarray = numpy.nonzero(targetRows >= 0)[0]
+
+        if len(chasing) == 0:
+            return
+
+        chasingRows: numpy.ndarray = chasing + fromIndex
+        targetRows = targetRows[chasing]
+        sprites: [Sprite] = [self.m_rows[row][1].sprite for row in chasingRows.tolist()]
+        x, y, width, height = AIProcessing.__rectsArray(sprites)
+        targetX, targetY, targetWidth, targetHeight = AIProcessing.__rectsArray(
+            [self.m_rows[row][1].sprite for row in targetRows.tolist()]
+        )
+
+        # Same test as Sprite.collides (pygame.Rect.colliderect).
+        colliding: numpy.ndarray = SpatialHash.Overlaps(
+            x, y, width, height, targetX, targetY, targetWidth, targetHeight
+        )
+
+        # Move towards the target.
+        moving: numpy.ndarray = numpy.nonzero(~colliding)[0]
+
+        if len(moving) > 0:
+            speeds: numpy.ndarray = self.m_factory.column('speed')[self.m_slots[chasingRows[moving]]].astype(numpy.int64)
+            movedX: numpy.ndarray = x[moving] + numpy.where(x[moving] < targetX[moving], speeds, -speeds)
+            movedY: numpy.ndarray = y[moving] + numpy.where(y[moving] < targetY[moving], speeds, -speeds)
+            movingSprites: [Sprite] = [sprites[index] for index in moving.tolist()]
+            Sprite.MoveMany(movingSprites, movedX.tolist(), movedY.tolist())
+
+            for sprite in movingSprites:
                 sprite.update()
-            else:
-                # Attack the target.
-                targetCharProps.life = max(0, targetCharProps.life - charProps.attack)
+
+        # Attack the target.
+        attacking: numpy.ndarray = numpy.nonzero(colliding)[0]
+
+        if len(attacking) > 0:
+            attacks: numpy.ndarray = self.m_factory.column('attack')[self.m_slots[chasingRows[attacking]]]
+            attackedRows: numpy.ndarray = targetRows[attacking]
+            targetSlots: numpy.ndarray = self.m_slots[attackedRows]
+
+            # Several characters (of several threads) can attack the same target. Clamping the sum of the attacks
+            # gives the same life as clamping after each attack.
+            with self.m_lock:
+                life: numpy.ndarray = self.m_factory.column('life')
+                numpy.subtract.at(life, targetSlots, attacks)
+                life[targetSlots] = numpy.maximum(life[targetSlots], 0)
+
+            for row in numpy.unique(attackedRows).tolist():
+                self.m_rows[row][2].markChanged()
+
+    def __refreshRows(self) -> None:
+        """Cache the rows of the Query with the slots of their CharacterPropertiesComponents and the row of each
+        entity index, when the Query has been rebuilt since the last time."""
+        if self.m_rows is self.m_query.rows:
+            return
+
+        with self.m_lock:
+            rows: [tuple] = self.m_query.rows
+
+            if self.m_rows is rows:
+                return
+
+            entityValues: numpy.ndarray = numpy.asarray(self.m_query.entities(), dtype=numpy.int64)
+            entityIndices: numpy.ndarray = entityValues & Entity.IndexMask
+            entityRows: numpy.ndarray = numpy.full(
+                int(entityIndices.max()) + 1 if len(entityIndices) > 0 else 0, -1, dtype=numpy.int64
+            )
+            entityRows[entityIndices] = numpy.arange(len(entityValues))
+            self.m_entityRows = entityRows
+            self.m_rowValues = entityValues
+            self.m_slots = numpy.fromiter((row[2].slot for row in rows), dtype=numpy.int64, count=len(rows))
+            self.m_factory = rows[0][2].factory if len(rows) > 0 else None
+            self.m_rows = rows
+
+    @staticmethod
+    def __rectsArray(sprites: [Sprite]) -> numpy.ndarray:
+        """Get the rects of the Sprites as rows of coordinates (x, y, width, height)."""
+        return numpy.fromiter(
+            itertools.chain.from_iterable([sprite.rect for sprite in sprites]),
+            dtype=numpy.int64,
+            count=4 * len(sprites)
+        ).reshape(-1, 4).T
 
     def run(self, linkedSystems: {str, 'System'}, fromIndex: int, toIndex: int) -> None:
-        """Perform the Components processing. Returns a list of Entity to be removed by the World."""
+        """Perform the Components processing over the rows of the bound Query (AI, Sprite, CharacterProperties)."""
+        if self.m_query is None or len(self.m_query.entities()) == 0:
+            return
+
         self.selectTarget(linkedSystems, fromIndex, toIndex)
         self.processAI(linkedSystems, fromIndex, toIndex)
-
-
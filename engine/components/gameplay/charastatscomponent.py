@@ -1,18 +1,29 @@
+import numpy
 from ecs.entities import Entity
-from ecs.components import Component, ComponentFactory
+from ecs.components import ComponentFactory
+from ecs.columns import ColumnarComponent
 from ecs.systems import SystemProcessing
 
 
-class CharacterPropertiesComponent(Component):
-    """Component containing the stats of a character."""
+class CharacterPropertiesComponent(ColumnarComponent):
+    """Component containing the stats of a character. The numeric stats are stored in columns of the factory."""
+
+    __slots__ = ('m_name',)
+
+    Columns: {str, (numpy.dtype, int)} = {
+        'life': (numpy.int32, 1),
+        'attack': (numpy.int32, 1),
+        'speed': (numpy.int32, 1)
+    }
 
     def __init__(self, entity: Entity):
         """Create a new CharaStatComponent instance."""
         super().__init__(entity)
         self.m_name: str = ""
-        self.m_life: int = 1
-        self.m_attack: int = 1
-        self.m_speed: int = 1
+
+    def reset(self) -> None:
+        """Clear the name before the Component is reused. Columns are reset by the factory."""
+        self.m_name = ""
 
     @property
     def name(self) -> str:
@@ -27,32 +38,32 @@ class CharacterPropertiesComponent(Component):
     @property
     def life(self) -> int:
         """Get the life."""
-        return self.m_life
+        return self.getField('life')
 
     @life.setter
     def life(self, life: int) -> None:
         """Set the life."""
-        self.m_life = life
+        self.setField('life', life)
 
     @property
     def attack(self) -> int:
         """Get the attack."""
-        return self.m_attack
+        return self.getField('attack')
 
-    @life.setter
+    @attack.setter
     def attack(self, attack: int) -> None:
         """Set the attack."""
-        self.m_attack = attack
+        self.setField('attack', attack)
 
     @property
     def speed(self) -> int:
         """Get the speed."""
-        return self.m_speed
+        return self.getField('speed')
 
     @speed.setter
     def speed(self, speed: int) -> None:
         """Set the speed."""
-        self.m_speed = speed
+        self.setField('speed', speed)
 
 
 class CharacterPropertiesProcessing(SystemProcessing):
@@ -66,11 +77,18 @@ class CharacterPropertiesProcessing(SystemProcessing):
         """Perform the CharacterPropertiesProcessing processing."""
         return self.filterEntities(fromIndex, toIndex)
 
+    def shouldRun(self) -> bool:
+        """Lives only have to be checked if some of them changed."""
+        return self.hasChangedComponents()
+
+    @staticmethod
+    def RunColumns(columns: {str, numpy.ndarray}, fromIndex: int, toIndex: int) -> [int]:
+        """Get the slots of the dead Characters in the index range."""
+        return (numpy.nonzero(columns['life'][fromIndex:toIndex] == 0)[0] + fromIndex).tolist()
+
     def filterEntities(self,  fromIndex: int, toIndex: int) -> None:
         """Filter Entities of dead Characters."""
-        charPropsComponentsList: [CharacterPropertiesComponent] = self.m_components.allComponents()
+        if not self.shouldRun():
+            return
 
-        for index in range(fromIndex, toIndex):
-            component: Component = charPropsComponentsList[index]
-            if component.life == 0:
-                self.m_dropEntities.append(component.entity)
+        self.dropSlots(self.RunColumns(self.columns(0, toIndex), fromIndex, toIndex))
@@ -11,6 +11,8 @@ from .gameplay.charastatscomponent import CharacterPropertiesComponent
 class Action:
     """Base class for defining an Action to be performed when an input is activated."""
 
+    __slots__ = ()
+
     def triggered(self) -> None:
         """What is done by the Action."""
         pass
@@ -19,6 +21,8 @@ class Action:
 class MoveCharacterAction(Action):
     """Class for moving a Character."""
 
+    __slots__ = ('m_spriteComponent', 'm_statsComponent', 'm_direction', 'm_moveShift')
+
     def __init__(
         self,
         spriteComponent: SpriteComponent,
@@ -62,11 +66,17 @@ class MoveCharacterAction(Action):
 class InputComponent(Component):
     """Component for setting the inputs (keyboard, mouse, controller, ...) applied on an Entity."""
 
+    __slots__ = ('m_keys',)
+
     def __init__(self, entity: Entity) -> None:
         """Create a new PositionComponent instance."""
         super().__init__(entity)
         self.m_keys: {pygame.constants, Action} = {}
 
+    def reset(self) -> None:
+        """Remove all the input keys before the Component is reused."""
+        self.m_keys = {}
+
     def addKey(self, action: [pygame.constants, Action]) -> None:
         """Add a new input key supported by the current Component."""
         self.m_keys[action[0]] = action[1]
@@ -8,6 +8,8 @@ from game.appdata import AppData
 class RenderingComponent(Component):
     """Component for performing the rendering."""
 
+    __slots__ = ()
+
     def __init__(self, entity: Entity) -> None:
         super().__init__(entity)
 
@@ -1,28 +1,44 @@
+import bisect
+import threading
 import pygame
 from ecs.components import Component, ComponentFactory
 from ecs.entities import Entity
 from ecs.systems import SystemProcessing, System
 from engine.graphics.sprite import Sprite
+from engine.spatial import SpatialHash
 from game.appdata import AppData
 
 class SpriteComponent(Component):
     """Component containing the graphics elements for drawing an animated item (character, monster, other)."""
 
+    __slots__ = ('m_sprite',)
 
     def __init__(self, entity: Entity) -> None:
         """Create a new SpriteComponent instance."""
         super().__init__(entity)
-        self.m_sprite: Sprite = Sprite()
+        self.m_sprite: Sprite = None
+
+    def reset(self) -> None:
+        """Release the Sprite before the Component is reused."""
+        self.m_sprite = None
+
+    @property
+    def hasSprite(self) -> bool:
+        """Check if a Sprite has been given to the Component."""
+        return self.m_sprite is not None
 
     @property
     def sprite(self) -> Sprite:
-        """Get the Sprite of the Component."""
+        """Get the Sprite of the Component, created empty on first access if none has been given."""
+        if self.m_sprite is None:
+            self.m_sprite = Sprite()
         return self.m_sprite
 
     @sprite.setter
     def sprite(self, sprite: Sprite) -> None:
         """Set the Sprite of the Component."""
         self.m_sprite = sprite
+        self.markChanged()
 
 
 class SpriteProcessing(SystemProcessing):
@@ -32,11 +48,21 @@ class SpriteProcessing(SystemProcessing):
         """Create a new SpriteProcessing instance."""
         super().__init__(components)
         self.m_spriteGroup: pygame.sprite.Group = None
+        self.m_spatialIndex: SpatialHash = None
+        # Slots of the Components changed since the last run, sorted and shared by the chunks of a run.
+        self.m_changedSlots: [int] = []
+        self.m_changedComponents: [SpriteComponent] = []
+        self.m_changesTick: int = None
+        self.m_changesLock: threading.Lock = threading.Lock()
 
     def setSpriteGroup(self, group: pygame.sprite.Group) -> None:
         """Set the group to which sprites are added."""
         self.m_spriteGroup = group
 
+    def setSpatialIndex(self, index: SpatialHash) -> None:
+        """Set the spatial index in which sprites are registered (by entity value) when added to the group."""
+        self.m_spatialIndex = index
+
     def onDelete(self, entity: Entity) -> None:
         """Do something when an entity is removed."""
         if self.m_spriteGroup is not None:
@@ -44,18 +70,46 @@ class SpriteProcessing(SystemProcessing):
             if len(components) > 0:
                 spriteComponent: SpriteComponent = components[0]
                 self.m_spriteGroup.remove(spriteComponent.sprite)
+                spriteComponent.sprite.detachSpatialIndex()
+
+    def shouldRun(self) -> bool:
+        """Sprites only have to be added to the group if some SpriteComponents changed."""
+        return self.hasChangedComponents()
 
     def run(self, linkedSystems: {str, 'System'}, fromIndex: int, toIndex: int) -> None:
-        """Perform the Components processing."""
+        """Perform the Components processing on the SpriteComponents created or given a new Sprite since the last
+        run."""
         if self.m_spriteGroup is None:
             return
 
-        spriteComponentsList: [SpriteComponent] = self.m_components.allComponents()
+        self.__collectChanges()
+        firstChange: int = bisect.bisect_left(self.m_changedSlots, fromIndex)
+        endChange: int = bisect.bisect_left(self.m_changedSlots, toIndex)
+
+        for spriteComponent in self.m_changedComponents[firstChange:endChange]:
+            if not spriteComponent.hasSprite:
+                continue
 
-        for spriteComponent in spriteComponentsList:
             sprite: Sprite = spriteComponent.sprite
 
             if sprite.ready and not self.m_spriteGroup.has(sprite):
                 AppData.wantAccess()
                 self.m_spriteGroup.add(sprite)
                 AppData.releaseAccess()
+
+            if sprite.ready and self.m_spatialIndex is not None and sprite.spatialIndex is not self.m_spatialIndex:
+                sprite.attachSpatialIndex(self.m_spatialIndex, spriteComponent.entityValue)
+
+    def __collectChanges(self) -> None:
+        """Sort the changed Components by slot, once for all the chunks of the current run."""
+        with self.m_changesLock:
+            if self.m_changesTick == self.m_components.tick:
+                return
+
+            changes: [(int, SpriteComponent)] = sorted(
+                ((self.m_components.slotOf(component), component) for component in self.changedComponents()),
+                key=lambda change: change[0]
+            )
+            self.m_changedSlots = [slot for slot, _ in changes]
+            self.m_changedComponents = [component for _, component in changes]
+            self.m_changesTick = self.m_components.tick
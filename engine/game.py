@@ -1,6 +1,7 @@
 import pygame
 from ecs.entities import Entity
 from ecs.world import World
+from engine.spatial import SpatialHash
 
 
 class Game:
@@ -11,8 +12,14 @@ class Game:
         pygame.init()
         self.m_entities: [Entity] = []
         self.m_world: World = World()
+        self.m_spatialIndex: SpatialHash = SpatialHash()
 
     @property
     def world(self) -> World:
         """Get the game ECS World."""
-        return self.m_world
\ No newline at end of file
+        return self.m_world
+
+    @property
+    def spatialIndex(self) -> SpatialHash:
+        """Get the spatial index of the Sprites of the Game."""
+        return self.m_spatialIndex
@@ -1,6 +1,8 @@
 class Point():
     """Define a 2D point."""
 
+    __slots__ = ('m_x', 'm_y')
+
     def __init__(self, x: int = 0, y: int = 0) -> None:
         self.m_x = x
         self.m_y = y
@@ -6,6 +6,8 @@ from engine.geometry import Point
 class Animation:
     """Animation of a Sprite."""
 
+    __slots__ = ('m_yPositions', 'm_amountSprites', 'm_width', 'm_currentDirection', 'm_currentIndex')
+
     def __init__(
             self,
             yPositions: {Direction, int},
@@ -70,6 +72,8 @@ class Sprite(pygame.sprite.Sprite):
     ) -> None:
         """Create a new Sprite instance."""
         super().__init__()
+        self.m_spatialIndex: 'SpatialHash' = None
+        self.m_spatialKey: object = None
 
         if len(spriteSheet):
             if spriteSheet not in Sprite.SpriteSheets:
@@ -170,6 +174,46 @@ class Sprite(pygame.sprite.Sprite):
         self.rect.topleft = position.asTuple()
         self.m_needUpdate = True
 
+        if self.m_spatialIndex is not None:
+            self.m_spatialIndex.update(self.m_spatialKey, self.rect)
+
+    @staticmethod
+    def MoveMany(sprites: ['Sprite'], xPositions: [int], yPositions: [int]) -> None:
+        """Set the positions of several Sprites at once (as the position setter does), updating their spatial index
+        in a single pass."""
+        for sprite, x, y in zip(sprites, xPositions, yPositions):
+            sprite.rect.topleft = (x, y)
+            sprite.m_needUpdate = True
+
+        indexes: set = {sprite.m_spatialIndex for sprite in sprites}
+        indexes.discard(None)
+
+        for index in indexes:
+            indexedSprites: ['Sprite'] = [sprite for sprite in sprites if sprite.m_spatialIndex is index]
+            index.updateMany(
+                [sprite.m_spatialKey for sprite in indexedSprites],
+                [sprite.rect for sprite in indexedSprites]
+            )
+
+    def attachSpatialIndex(self, index: 'SpatialHash', key: object) -> None:
+        """Register the Sprite in a spatial index under the given key, kept up to date when its position changes."""
+        self.detachSpatialIndex()
+        self.m_spatialIndex = index
+        self.m_spatialKey = key
+        index.update(key, self.rect)
+
+    def detachSpatialIndex(self) -> None:
+        """Remove the Sprite from its spatial index, if any."""
+        if self.m_spatialIndex is not None:
+            self.m_spatialIndex.remove(self.m_spatialKey)
+            self.m_spatialIndex = None
+            self.m_spatialKey = None
+
+    @property
+    def spatialIndex(self) -> 'SpatialHash':
+        """Get the spatial index in which the Sprite is registered, None if there is none."""
+        return self.m_spatialIndex
+
     @property
     def ready(self) -> bool:
         return self.image is not None
@@ -1,4 +1,6 @@
+import asyncio
 import pygame
+import time
 
 class MainWindow:
     """Main window of the game."""
@@ -16,6 +18,7 @@ class MainWindow:
         pygame.display.set_caption(caption)
         self.m_framerate: int = 60
         self.m_clock: pygame.time = pygame.time.Clock()
+        self.m_lastFrameTime: float = time.perf_counter()
         self.m_clearColor: (int, int, int) = (0, 0, 0)
         self.m_showFPS: bool = False
         self.m_fpsFont = pygame.font.SysFont('Arial', 18)
@@ -76,7 +79,23 @@ class MainWindow:
     def update(self) -> None:
         """Update the content of the MainWindow and wait for the next frame."""
         self.m_clock.tick(self.m_framerate)
+        self.__present()
 
+    async def updateAsync(self) -> None:
+        """Update the content of the MainWindow and wait for the next frame, letting the event loop run other tasks
+        meanwhile."""
+        if self.m_framerate > 0:
+            remainingTime: float = self.m_lastFrameTime + 1. / self.m_framerate - time.perf_counter()
+
+            if remainingTime > 0:
+                await asyncio.sleep(remainingTime)
+
+        self.m_lastFrameTime = time.perf_counter()
+        self.m_clock.tick()
+        self.__present()
+
+    def __present(self) -> None:
+        """Show the content of the MainWindow."""
         if self.m_showFPS:
             self.m_surface.blit(self.updateFPS(), (10,0))
 
@@ -0,0 +1,265 @@
+import itertools
+import numpy
+import pygame
+import threading
+from engine.geometry import Point
+
+
+class SpatialHash:
+    """Spatial index of the rects of the Sprites, in the cells of a uniform grid."""
+
+    def __init__(self, cellSize: int = 64) -> None:
+        """Create a new SpatialHash instance, with square cells of the given size (in pixels). The size should be
+        close to the size of the items, so that each one overlaps few cells."""
+        self.m_cellSize: int = max(1, cellSize)
+        self.m_cells: {(int, int), set} = {}
+        self.m_items: dict = {}
+        self.m_lock: threading.Lock = threading.Lock()
+        self.m_minCell: (int, int) = (0, 0)
+        self.m_maxCell: (int, int) = (0, 0)
+
+    def __len__(self) -> int:
+        """Get the amount of items in the index."""
+        return len(self.m_items)
+
+    def __contains__(self, key: object) -> bool:
+        """Check if an item is in the index."""
+        return key in self.m_items
+
+    @property
+    def cellSize(self) -> int:
+        """Get the size of the cells (in pixels)."""
+        return self.m_cellSize
+
+    def rectOf(self, key: object) -> pygame.Rect:
+        """Get the rect of an item, None if it is not in the index."""
+        item: tuple = self.m_items.get(key)
+        return None if item is None else item[0]
+
+    def update(self, key: object, rect: pygame.Rect) -> None:
+        """Insert an item or move it to the cells of its rect. The rect (a pygame.Rect or a tuple x, y, width,
+        height) is kept by reference: the queries see a pygame.Rect moved in place, but its cells only follow it on
+        the next update."""
+        cellRange: (int, int, int, int) = self.__cellRange(rect)
+        previous: tuple = self.m_items.get(key)
+
+        # Moving within the same cells only replaces the rect, which needs no lock.
+        if previous is not None and previous[1] == cellRange:
+            if previous[0] is not rect:
+                self.m_items[key] = (rect, cellRange)
+            return
+
+        with self.m_lock:
+            self.__move(key, rect, cellRange)
+
+    insert = update
+
+    def updateMany(self, keys: [object], rects: [pygame.Rect]) -> None:
+        """Insert or move several items at once, their cells being computed with NumPy and the lock being taken once
+        for all the items changing of cells."""
+        if len(keys) == 0:
+            return
+
+        coordinates: numpy.ndarray = numpy.fromiter(
+            itertools.chain.from_iterable(rects), dtype=numpy.int64, count=4 * len(keys)
+        ).reshape(-1, 4).T
+        firstCells: numpy.ndarray = coordinates[:2] // self.m_cellSize
+        lastCells: numpy.ndarray = (coordinates[:2] + numpy.maximum(coordinates[2:], 1) - 1) // self.m_cellSize
+        items: dict = self.m_items
+        moves: [(object, pygame.Rect, tuple)] = []
+
+        for key, rect, firstX, firstY, lastX, lastY in zip(keys, rects, *firstCells.tolist(), *lastCells.tolist()):
+            cellRange: (int, int, int, int) = (firstX, firstY, lastX, lastY)
+            previous: tuple = items.get(key)
+
+            if previous is None or previous[1] != cellRange or previous[0] is not rect:
+                moves.append((key, rect, cellRange))
+
+        if len(moves) > 0:
+            with self.m_lock:
+                for key, rect, cellRange in moves:
+                    self.__move(key, rect, cellRange)
+
+    def remove(self, key: object) -> None:
+        """Remove an item from the index, if present."""
+        with self.m_lock:
+            previous: tuple = self.m_items.pop(key, None)
+
+            if previous is not None:
+                self.__unlink(key, previous[1])
+
+    def clear(self) -> None:
+        """Remove all the items."""
+        with self.m_lock:
+            self.m_cells = {}
+            self.m_items = {}
+
+    @staticmethod
+    def Overlaps(
+            x: int, y: int, width: int, height: int,
+            otherX: int, otherY: int, otherWidth: int, otherHeight: int
+    ) -> bool:
+        """Check if two rects overlap as pygame.Rect.colliderect does (an empty rect overlaps nothing)."""
+        return (
+            (width > 0) & (height > 0) & (otherWidth > 0) & (otherHeight > 0)
+            & (x < otherX + otherWidth) & (otherX < x + width) & (y < otherY + otherHeight) & (otherY < y + height)
+        )
+
+    def queryRect(self, rect: (int, int, int, int)) -> [object]:
+        """Get the items whose rect overlaps the given one (x, y, width, height), with the semantics of
+        pygame.Rect.colliderect."""
+        x, y, width, height = rect[0], rect[1], rect[2], rect[3]
+        found: [object] = []
+
+        for key in self.__keysIn(self.__cellRange((x, y, width, height))):
+            otherRect: pygame.Rect = self.m_items[key][0]
+
+            if SpatialHash.Overlaps(x, y, width, height, otherRect[0], otherRect[1], otherRect[2], otherRect[3]):
+                found.append(key)
+
+        return found
+
+    def queryRange(self, center: Point, radius: float) -> [object]:
+        """Get the items whose rect is at most at radius from the center."""
+        cellRange: (int, int, int, int) = self.__cellRange(
+            (int(center.x - radius), int(center.y - radius), int(2 * radius) + 2, int(2 * radius) + 2)
+        )
+        squaredRadius: float = radius * radius
+        return [
+            key for key in self.__keysIn(cellRange)
+            if SpatialHash.__squaredDistance(center.x, center.y, self.m_items[key][0]) <= squaredRadius
+        ]
+
+    def nearest(self, point: Point, k: int = 1, exclude: object = None) -> [object]:
+        """Get the k items whose rect is the closest to the point, the closest first, without the excluded key.
+        The rings of cells around the point are visited until no unvisited cell can hold a closer item."""
+        if k <= 0:
+            return []
+
+        cellSize: int = self.m_cellSize
+        pointX: float = point.x
+        pointY: float = point.y
+        cellX: int = int(pointX // cellSize)
+        cellY: int = int(pointY // cellSize)
+        maxRing: int = max(
+            cellX - self.m_minCell[0], self.m_maxCell[0] - cellX,
+            cellY - self.m_minCell[1], self.m_maxCell[1] - cellY,
+            0
+        )
+        seen: set = {exclude}
+        candidates: [(float, object)] = []
+
+        for ring in range(maxRing + 1):
+            for cell in SpatialHash.__ring(cellX, cellY, ring):
+                for key in tuple(self.m_cells.get(cell, ())):
+                    if key in seen:
+                        continue
+
+                    seen.add(key)
+                    item: tuple = self.m_items.get(key)
+
+                    if item is not None:
+                        candidates.append((SpatialHash.__squaredDistance(pointX, pointY, item[0]), key))
+
+            # Items of the cells beyond this ring are at least ring cells away from the point.
+            if len(candidates) >= k:
+                candidates.sort(key=lambda candidate: candidate[0])
+                reach: float = ring * cellSize
+
+                if candidates[k - 1][0] <= reach * reach:
+                    break
+
+        candidates.sort(key=lambda candidate: candidate[0])
+        return [key for _, key in candidates[:k]]
+
+    def __cellRange(self, rect: (int, int, int, int)) -> (int, int, int, int):
+        """Get the first and last cells (column, row) overlapped by a rect."""
+        cellSize: int = self.m_cellSize
+        return (
+            int(rect[0] // cellSize),
+            int(rect[1] // cellSize),
+            int((rect[0] + max(rect[2], 1) - 1) // cellSize),
+            int((rect[1] + max(rect[3], 1) - 1) // cellSize)
+        )
+
+    def __move(self, key: object, rect: pygame.Rect, cellRange: (int, int, int, int)) -> None:
+        """Set the rect of an item and move it to the cells of the range (the lock being held)."""
+        previous: tuple = self.m_items.get(key)
+        self.m_items[key] = (rect, cellRange)
+
+        if previous is not None:
+            if previous[1] == cellRange:
+                return
+
+            self.__unlink(key, previous[1])
+
+        self.__link(key, cellRange)
+
+    def __link(self, key: object, cellRange: (int, int, int, int)) -> None:
+        """Add an item to the cells of the range."""
+        firstX, firstY, lastX, lastY = cellRange
+
+        for cellX in range(firstX, lastX + 1):
+            for cellY in range(firstY, lastY + 1):
+                cell: set = self.m_cells.get((cellX, cellY))
+
+                if cell is None:
+                    cell = self.m_cells[(cellX, cellY)] = set()
+
+                cell.add(key)
+
+        self.m_minCell = (min(self.m_minCell[0], firstX), min(self.m_minCell[1], firstY))
+        self.m_maxCell = (max(self.m_maxCell[0], lastX), max(self.m_maxCell[1], lastY))
+
+    def __unlink(self, key: object, cellRange: (int, int, int, int)) -> None:
+        """Remove an item from the cells of the range, dropping the cells left empty."""
+        firstX, firstY, lastX, lastY = cellRange
+
+        for cellX in range(firstX, lastX + 1):
+            for cellY in range(firstY, lastY + 1):
+                cell: set = self.m_cells.get((cellX, cellY))
+
+                if cell is not None:
+                    cell.discard(key)
+
+                    if len(cell) == 0:
+                        del self.m_cells[(cellX, cellY)]
+
+    def __keysIn(self, cellRange: (int, int, int, int)) -> set:
+        """Get the items of the cells of the range."""
+        firstX, firstY, lastX, lastY = cellRange
+        keys: set = set()
+
+        for cellX in range(firstX, lastX + 1):
+            for cellY in range(firstY, lastY + 1):
+                cell: set = self.m_cells.get((cellX, cellY))
+
+                if cell is not None:
+                    keys.update(tuple(cell))
+
+        return keys
+
+    @staticmethod
+    def __ring(cellX: int, cellY: int, ring: int) -> [(int, int)]:
+        """Get the cells at the given Chebyshev distance of a cell."""
+        if ring == 0:
+            return [(cellX, cellY)]
+
+        cells: [(int, int)] = []
+
+        for offset in range(-ring, ring + 1):
+            cells.append((cellX + offset, cellY - ring))
+            cells.append((cellX + offset, cellY + ring))
+
+        for offset in range(-ring + 1, ring):
+            cells.append((cellX - ring, cellY + offset))
+            cells.append((cellX + ring, cellY + offset))
+
+        return cells
+
+    @staticmethod
+    def __squaredDistance(pointX: float, pointY: float, rect: (int, int, int, int)) -> float:
+        """Get the squared distance between a point and the closest point of a rect."""
+        deltaX: float = max(rect[0] - pointX, 0, pointX - (rect[0] + rect[2]))
+        deltaY: float = max(rect[1] - pointY, 0, pointY - (rect[1] + rect[3]))
+        return deltaX * deltaX + deltaY * deltaY
@@ -1,9 +1,14 @@
+import asyncio
 import pygame
+import time
 from engine.mainwindow import MainWindow
 from game.appdata import AppData
 from game.crystalshot import CrystalShot
 
-if __name__ == '__main__':
+
+async def main() -> None:
+    """Run the frames of the game from an asyncio event loop, so that the I/O of the Systems is awaited while the
+    frames go on. The simulation runs at a fixed timestep, whatever the framerate."""
     framerate: int = 60
     csGame: CrystalShot = CrystalShot(framerate)
     AppData.window().framerate = framerate
@@ -11,6 +16,7 @@ if __name__ == '__main__':
     AppData.window().clearColor = (0, 0, 0)
 
     running: bool = True
+    previousTime: float = time.perf_counter()
 
     while running:
         for event in pygame.event.get():
@@ -21,7 +27,12 @@ if __name__ == '__main__':
                 AppData.window().resize(event.size[0], event.size[1])
 
         AppData.window().clear()
-        csGame.world.run()
-        AppData.window().update()
+        currentTime: float = time.perf_counter()
+        await csGame.world.advanceAsync(currentTime - previousTime)
+        previousTime = currentTime
+        await AppData.window().updateAsync()
 
+
+if __name__ == '__main__':
+    asyncio.run(main())
     MainWindow.end()
@@ -6,7 +6,6 @@ from engine.components.spritecomponent import SpriteComponent
 from engine.components.inputcomponent import InputComponent
 from engine.components.renderingcomponent import RenderingComponent
 from engine.components.gameplay.charastatscomponent import CharacterPropertiesComponent
-from engine.components.gameplay.aicomponent import AIComponent
 from game.appdata import SystemName
 
 
@@ -80,22 +79,3 @@ class Player(Character):
         """Get the InputComponent of the Player."""
         return self.m_inputComponent
 
-
-class Bot(Character):
-    """Class for a Bot that is controlled by the CPU."""
-
-    def __init__(self, world: World, name: str = "Bot"):
-        """Create a new Bot instance."""
-        super().__init__(world, name)
-        self.m_aiComponent: AIComponent = None
-        self.__createAIComponent(world)
-
-    def __createAIComponent(self, world) -> None:
-        """Create the AIComponent to control the Bot."""
-        aiSystem: System = world.system(SystemName.ai())
-        self.m_aiComponent = aiSystem.create(self.m_entity)
-
-    @property
-    def aiComponent(self) -> AIComponent:
-        """Get the AIComponent of the Bot."""
-        return self.m_aiComponent
\ No newline at end of file
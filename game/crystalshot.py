@@ -11,8 +11,8 @@ from engine.components.gameplay.aicomponent import AIComponent, AIProcessing
 from engine.graphics.sprite import Sprite, Direction
 from engine.geometry import Point
 from engine.game import Game
-from game.appdata import SystemName, AnimationName, SystemGroupName
-from characters import Player, Bot
+from game.appdata import SystemName, AnimationName
+from characters import Player
 
 
 class CrystalShot(Game):
@@ -36,28 +36,35 @@ class CrystalShot(Game):
         renderingSystem.create(renderEntity)
 
     def __generateBots(self, count: int) -> None:
-        """Generate the Bots of the Game."""
-        for index in range(count):
-            newBot: Bot = Bot(self.m_world)
-            self.m_entities.append(newBot.entity)
-
-            SpriteWidth: int = 64
-            SpriteHeight: int = 64
-            AmountSprites: int = 9
-            WalkAnimationDirections: {Direction, int} = {
-                Direction.UP: 8,
-                Direction.LEFT: 9,
-                Direction.DOWN: 10,
-                Direction.RIGHT: 11
-            }
-            newBot.spriteComponent.sprite = Sprite('resources/img/sprites/skeleton.png', SpriteWidth, SpriteHeight)
-            newBot.spriteComponent.sprite.addAnimation(AnimationName.walk(), WalkAnimationDirections, AmountSprites)
-            newBot.spriteComponent.sprite.changeAnimation(AnimationName.walk())
-
-            newBot.propertiesComponent.speed = random.randint(1, 2)
-            newBot.propertiesComponent.life = random.randint(3999, 9999)
-            newBot.propertiesComponent.attack = random.randint(2, 20)
-            newBot.position = Point(random.randint(0, 800), random.randint(0, 600))
+        """Generate the Bots of the Game, all at once."""
+        SpriteWidth: int = 64
+        SpriteHeight: int = 64
+        AmountSprites: int = 9
+        WalkAnimationDirections: {Direction, int} = {
+            Direction.UP: 8,
+            Direction.LEFT: 9,
+            Direction.DOWN: 10,
+            Direction.RIGHT: 11
+        }
+
+        def initSprite(spriteComponent: SpriteComponent, index: int) -> None:
+            spriteComponent.sprite = Sprite('resources/img/sprites/skeleton.png', SpriteWidth, SpriteHeight)
+            spriteComponent.sprite.addAnimation(AnimationName.walk(), WalkAnimationDirections, AmountSprites)
+            spriteComponent.sprite.changeAnimation(AnimationName.walk())
+            spriteComponent.sprite.position = Point(random.randint(0, 800), random.randint(0, 600))
+
+        def initProperties(propertiesComponent: CharacterPropertiesComponent, index: int) -> None:
+            propertiesComponent.name = "Bot"
+            propertiesComponent.speed = random.randint(1, 2)
+            propertiesComponent.life = random.randint(3999, 9999)
+            propertiesComponent.attack = random.randint(2, 20)
+
+        newEntities: [Entity] = self.m_world.spawnBatch(count, {
+            SystemName.sprite(): initSprite,
+            SystemName.characterProperties(): initProperties,
+            SystemName.ai(): None
+        })
+        self.m_entities.extend(newEntities)
 
     def __generatePlayer(self) -> None:
         """Generate the Player of the Game."""
@@ -114,23 +121,29 @@ class CrystalShot(Game):
     def __createSystems(self) -> None:
         """Create the different Systems of the Game."""
         inputSystem: System = self.m_world.system(SystemName.input(), InputComponent, InputProcessing)
+        inputSystem.declareReads(CharacterPropertiesComponent).declareWrites(SpriteComponent)
         spriteSystem: System = self.m_world.system(SystemName.sprite(), SpriteComponent, SpriteProcessing)
         spriteSystem.processing.setSpriteGroup(self.m_spriteGroup)
+        spriteSystem.processing.setSpatialIndex(self.m_spatialIndex)
 
         charPropSystem: System = self.m_world.system(
             SystemName.characterProperties(),
             CharacterPropertiesComponent,
             CharacterPropertiesProcessing
         )
+        charPropSystem.tickRate = 20
 
         aiSystem: System = self.m_world.system(SystemName.ai(), AIComponent, AIProcessing)
         aiSystem.link(spriteSystem)
         aiSystem.link(charPropSystem)
+        aiSystem.bindQuery(self.m_world.query(AIComponent, SpriteComponent, CharacterPropertiesComponent))
+        aiSystem.declareWrites(SpriteComponent, CharacterPropertiesComponent)
+        aiSystem.processing.setSpatialIndex(self.m_spatialIndex)
 
         renderingSystem: System = self.m_world.system(SystemName.rendering(), RenderingComponent, RenderingProcessing)
         renderingSystem.multithreadable = False
+        renderingSystem.everyFrame = True
         renderingSystem.processing.setSpriteGroup(self.m_spriteGroup)
+        renderingSystem.declareReads(SpriteComponent)
 
-        self.m_world.addJob(SystemGroupName.prepare(), [SystemName.input(), SystemName.sprite(), SystemName.characterProperties()], threadCount=6)
-        self.m_world.addJob(SystemGroupName.airuns(), [SystemName.ai()], threadCount=6)
-        self.m_world.addJob(SystemGroupName.render(), [SystemName.rendering()], threadCount=1)
+        self.m_world.autoSchedule(threadCount=6)